@@ -6,6 +6,18 @@ from teams_webhook import TeamsWebhook, SeverityLevel
 from settings import Settings
 
 
+# Thread pools requested from _cat/thread_pool and evaluated for queue/rejection alerts
+MONITORED_THREAD_POOLS = frozenset(("search", "write", "bulk"))
+
+# Bytes of a response body shown in debug logs; breaker and node stats bodies can run to megabytes
+MAX_LOGGED_BODY_BYTES = 512
+
+
+def _body_preview(response: requests.Response) -> str:
+    """Decode only the head of a response body for logging instead of the full response.text"""
+    return response.content[:MAX_LOGGED_BODY_BYTES].decode("utf-8", "replace")
+
+
 class HealthAlert:
     def __init__(self, check_name: str, severity: SeverityLevel, message: str, details: Optional[Dict[str, Any]] = None):
         self.check_name = check_name
@@ -106,7 +118,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug("Checking cluster health")
             response = self.session.get(f"{self.settings.url}/_cluster/health")
-            logger.debug(f"Cluster health HTTP response: status_code={response.status_code}, content={response.text}")
+            logger.opt(lazy=True).debug("Cluster health HTTP response: status_code={}, content={}", lambda: response.status_code, lambda: _body_preview(response))
             response.raise_for_status()
             data = response.json()
             
@@ -180,7 +192,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug("Checking disk space usage")
             response = self.session.get(f"{self.settings.url}/_cat/nodes?v&h=n,id,v,r,rp,dt,du,dup&format=json")
-            logger.debug(f"Disk space HTTP response: status_code={response.status_code}, content={response.text}")
+            logger.opt(lazy=True).debug("Disk space HTTP response: status_code={}, content={}", lambda: response.status_code, lambda: _body_preview(response))
             response.raise_for_status()
             data = response.json()
             
@@ -252,7 +264,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug("Checking JVM heap memory usage")
             response = self.session.get(f"{self.settings.url}/_cat/nodes?v&h=n,hp,hm,hc&format=json")
-            logger.debug(f"JVM heap HTTP response: status_code={response.status_code}, content={response.text}")
+            logger.opt(lazy=True).debug("JVM heap HTTP response: status_code={}, content={}", lambda: response.status_code, lambda: _body_preview(response))
             response.raise_for_status()
             data = response.json()
             
@@ -328,7 +340,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug("Checking circuit breaker status")
             response = self.session.get(f"{self.settings.url}/_nodes/stats/breaker")
-            logger.debug(f"Circuit breaker HTTP response: status_code={response.status_code}, content_length={len(response.text)}")
+            logger.opt(lazy=True).debug("Circuit breaker HTTP response: status_code={}, content_length={}", lambda: response.status_code, lambda: len(response.content))
             response.raise_for_status()
             data = response.json()
             
@@ -485,7 +497,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug("Checking thread pool queue status")
             response = self.session.get(f"{self.settings.url}/_cat/thread_pool/search,write,bulk?v&h=n,name,active,queue,rejected&format=json")
-            logger.debug(f"Thread pool HTTP response: status_code={response.status_code}, content_length={len(response.text)}")
+            logger.opt(lazy=True).debug("Thread pool HTTP response: status_code={}, content_length={}", lambda: response.status_code, lambda: len(response.content))
             response.raise_for_status()
             data = response.json()
             
@@ -495,53 +507,56 @@ class OpenSearchHealthMonitor:
             
             for pool_data in data:
                 try:
-                    node_name = pool_data.get("n", "unknown")
                     pool_name = pool_data.get("name", "unknown")
+                    
+                    # Critical thread pools to monitor - skip other rows before parsing their counters
+                    if pool_name not in MONITORED_THREAD_POOLS:
+                        continue
+                    
+                    node_name = pool_data.get("n", "unknown")
                     active = int(pool_data.get("active", 0))
                     queue = int(pool_data.get("queue", 0))
                     rejected = int(pool_data.get("rejected", 0))
                     
-                    # Critical thread pools to monitor
-                    if pool_name in ["search", "write", "bulk"]:
-                        # Alert on high queue size (always check - queue sizes are transient)
-                        if queue >= 100:  # Critical threshold
-                            high_queue_nodes.append({
-                                "node": node_name,
-                                "pool": pool_name,
-                                "queue_size": queue,
-                                "active": active,
-                                "rejected": rejected,
-                                "severity": "critical"
-                            })
-                        elif queue >= 50:  # Warning threshold
-                            high_queue_nodes.append({
-                                "node": node_name,
-                                "pool": pool_name,
-                                "queue_size": queue,
-                                "active": active,
-                                "rejected": rejected,
-                                "severity": "warning"
-                            })
-                        
-                        # Track rejections for NEW rejections only
-                        if node_name not in current_rejections:
-                            current_rejections[node_name] = {}
-                        current_rejections[node_name][pool_name] = rejected
-                        
-                        # Check for NEW rejections
-                        previous_rejected = self._previous_thread_pool_rejections.get(node_name, {}).get(pool_name, 0)
-                        new_rejections = rejected - previous_rejected
+                    # Alert on high queue size (always check - queue sizes are transient)
+                    if queue >= 100:  # Critical threshold
+                        high_queue_nodes.append({
+                            "node": node_name,
+                            "pool": pool_name,
+                            "queue_size": queue,
+                            "active": active,
+                            "rejected": rejected,
+                            "severity": "critical"
+                        })
+                    elif queue >= 50:  # Warning threshold
+                        high_queue_nodes.append({
+                            "node": node_name,
+                            "pool": pool_name,
+                            "queue_size": queue,
+                            "active": active,
+                            "rejected": rejected,
+                            "severity": "warning"
+                        })
+                    
+                    # Track rejections for NEW rejections only
+                    if node_name not in current_rejections:
+                        current_rejections[node_name] = {}
+                    current_rejections[node_name][pool_name] = rejected
+                    
+                    # Check for NEW rejections
+                    previous_rejected = self._previous_thread_pool_rejections.get(node_name, {}).get(pool_name, 0)
+                    new_rejections = rejected - previous_rejected
+                    
+                    if new_rejections > 0:
+                        new_rejection_nodes.append({
+                            "node": node_name,
+                            "pool": pool_name,
+                            "new_rejections": new_rejections,
+                            "total_rejections": rejected,
+                            "queue_size": queue,
+                            "active": active
+                        })
                         
-                        if new_rejections > 0:
-                            new_rejection_nodes.append({
-                                "node": node_name,
-                                "pool": pool_name,
-                                "new_rejections": new_rejections,
-                                "total_rejections": rejected,
-                                "queue_size": queue,
-                                "active": active
-                            })
-                            
                 except (ValueError, TypeError) as e:
                     logger.warning(f"Could not parse thread pool data for node {pool_data.get('n', 'unknown')}: {e}")
                     continue
@@ -613,7 +628,7 @@ class OpenSearchHealthMonitor:
         try:
             logger.debug(f"Checking {repository} snapshots")
             response = self.session.get(f"{self.settings.url}/_cat/snapshots/{repository}?v&s=endEpoch&format=json")
-            logger.debug(f"{repository} snapshots HTTP response: status_code={response.status_code}, content={response.text}")
+            logger.opt(lazy=True).debug("{} snapshots HTTP response: status_code={}, content={}", lambda: repository, lambda: response.status_code, lambda: _body_preview(response))
             response.raise_for_status()
             data = response.json()
             
@@ -1,8 +1,15 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union
 from settings import Settings
 from loguru import logger
 
+# Upper bound on concurrent DELETE requests when removing expired searchable snapshot indices
+MAX_PARALLEL_INDEX_DELETES = 8
+
+# Longest comma-joined snapshot name list put in one URL; OpenSearch rejects request lines over 4kb by default
+MAX_SNAPSHOT_NAMES_URL_LENGTH = 3000
+
 class Ilm:
     """Manages OpenSearch index lifecycle with size-based rollover and searchable snapshots"""
 
@@ -12,9 +19,18 @@ class Ilm:
         self.rollover_size_gb: int = settings.rollover_size_gb
         self.rollover_age_days: int = settings.rollover_age_days
         self.managed_index_patterns: tuple = settings.managed_index_patterns
+        self.max_transitions_per_cycle: int = settings.max_transitions_per_cycle
         
         self.requests = settings.get_requests_object()
         self.base_url: str = settings.url
+
+        # Cluster listings shared by the operations of one ILM sweep; dropped whenever we change the cluster
+        self._indices_cache: Optional[List[Dict[str, Any]]] = None
+        self._snapshots_cache: Optional[List[Dict[str, Any]]] = None
+        # Write-index flag per index from one GET /_alias, shared by a transition or cleanup sweep; only rollover changes it
+        self._write_index_map: Optional[Dict[str, bool]] = None
+        # Creation date and store type per index from one GET /_settings, shared by a transition or cleanup sweep
+        self._index_settings_map: Optional[Dict[str, Dict[str, Any]]] = None
         
         # Validate configuration
         self._validate_configuration()
@@ -29,90 +45,68 @@ class Ilm:
             return
             
         logger.info(f"Moving indices older than {self.hot_storage_days} days to snapshots")
+        self._write_index_map = None  # Re-read write indices and index settings once per sweep
+        self._index_settings_map = None
         
-        for index_info in self.get_indices():
-            index_name = index_info['index']
-            
-            if not self._should_manage_index(index_name):
-                continue
-                
-            if self._is_ready_for_snapshot(index_name):
-                logger.info(f"Processing {index_name} for snapshot")
-                self._snapshot_and_replace_index(index_name)
+        # Select against the sweep's alias and settings maps first, then snapshot; selection only reads
+        # in-memory tables, so every index is judged on the same cluster state before any of it changes
+        ready_indices = [
+            index_info['index'] for index_info in self.get_indices()
+            if self._should_manage_index(index_info['index']) and self._is_ready_for_snapshot(index_info['index'])
+        ]
+        logger.info(f"Found {len(ready_indices)} indices ready for snapshot")
+
+        # Oldest first, capped per sweep so a large backlog is worked off over several runs; ages come from the settings map
+        ready_indices.sort(key=self._get_index_age_days, reverse=True)
+        if len(ready_indices) > self.max_transitions_per_cycle:
+            logger.info(f"Transitioning the {self.max_transitions_per_cycle} oldest indices this sweep, deferring {len(ready_indices) - self.max_transitions_per_cycle} to the next")
+            ready_indices = ready_indices[:self.max_transitions_per_cycle]
+
+        for index_name in ready_indices:
+            logger.info(f"Processing {index_name} for snapshot")
+            self._snapshot_and_replace_index(index_name)
 
     def cleanup_old_data(self) -> None:
         """Delete indices and snapshots past retention period using three-phase approach"""
         logger.info(f"Cleaning up data older than {self.total_retention_days} days")
-
-        # Phase 1: Delete searchable snapshot indices older than retention
-        logger.info("Phase 1: Deleting expired searchable snapshot indices (mounted snapshots)...")
         indices = self.get_indices()
         snapshots = self.get_snapshots()  # Fetch once for all searchable snapshots
-        for index_info in indices:
-            index_name = index_info['index']
-            if index_name.endswith('-snapshot'):
-                # Extract base index name to check if it should be managed
-                base_index_name = index_name.replace('-snapshot', '')
-                if self._should_manage_index(base_index_name):
-                    age_days = self._get_searchable_snapshot_age_days(index_name, snapshots)
-                    if age_days >= self.total_retention_days:
-                        logger.info(f"Deleting old searchable snapshot index {index_name} ({age_days:.1f} days old)")
-                        self._delete_index(index_name)
+        # Shared by both phases below; filled here so the concurrent phases never fetch them lazily side by side
+        self._write_index_map = self._fetch_write_index_map()
+        self._index_settings_map = self._fetch_index_settings_map()
 
-        # Phase 2: Delete regular managed indices older than retention, then their corresponding snapshots
-        logger.info("Phase 2: Deleting expired regular indices and their backing snapshots...")
-        for index_info in indices:
-            index_name = index_info['index']
-            if not self._should_manage_index(index_name):
-                continue
-            if index_name.endswith('-snapshot'):  # Skip searchable snapshots, handled in phase 1
-                continue
-                
-            age_days = self._get_index_age_days(index_name)
-            if age_days >= self.total_retention_days:
-                logger.info(f"Deleting old index {index_name} ({age_days:.1f} days old)")
-                self._delete_index(index_name)
-                
-                # Also try to delete corresponding snapshot
-                corresponding_snapshot = self._get_corresponding_snapshot_name(index_name)
-                if corresponding_snapshot:
-                    logger.info(f"Deleting corresponding snapshot {corresponding_snapshot}")
-                    self._delete_snapshot(corresponding_snapshot)
+        # Phases 1 and 2 touch disjoint indices, so run them side by side. Leaving the executor waits for
+        # both: phase 3 needs the snapshots phase 2 queues and phase 1's unmounts, as a snapshot cannot be
+        # deleted while it is still mounted as a searchable index.
+        with ThreadPoolExecutor(max_workers=2) as phase_executor:
+            phase1 = phase_executor.submit(self._delete_expired_searchable_indices, indices, snapshots)
+            phase2 = phase_executor.submit(self._delete_expired_regular_indices, indices)
 
-        # Phase 3: For each old snapshot, unmount any searchable snapshot indices referencing it, then delete snapshot
-        logger.info("Phase 3: Cleaning up orphaned snapshots and their mounted indices...")
-        snapshots = self.get_snapshots()
-        for snapshot in snapshots:
-            snapshot_age = self._snapshot_age_days(snapshot)
-            
-            # Skip snapshots with unknown ages
-            if snapshot_age < 0:
-                logger.debug(f"Snapshot {snapshot['id']} has unknown age; skipping age-based deletion")
-                continue
-            
-            # Sanity check for unreasonable ages
-            if snapshot_age >= 20000:  # ~55 years
-                logger.warning(
-                    f"Snapshot {snapshot['id']} computed age={snapshot_age:.1f}d — likely missing/zero end_epoch; "
-                    f"verify snapshot state and fields (endEpoch/startEpoch)"
-                )
-                continue
-                
-            if snapshot_age >= self.total_retention_days:
-                logger.info(f"Deleting old snapshot {snapshot['id']} ({snapshot_age:.1f} days old)")
-                self._delete_snapshot_with_cleanup(snapshot['id'])
+        # A failing phase is logged and does not stop the remaining cleanup
+        if phase1.exception():
+            logger.error(f"Phase 1 cleanup failed: {phase1.exception()}")
+        expired_snapshots = []
+        if phase2.exception():
+            logger.error(f"Phase 2 cleanup failed: {phase2.exception()}")
+        else:
+            expired_snapshots = phase2.result()
+
+        # Snapshots still backing a mounted index cannot be deleted; phase 3 skips those phase 1 left behind
+        mounted_indices = frozenset(info['index'] for info in indices if info['index'].endswith('-snapshot'))
+        self._delete_expired_snapshots(expired_snapshots, mounted_indices)
 
     def restore_missing_searchable_snapshots(self) -> None:
         """Restore searchable snapshots for all regular snapshots that don't have corresponding indices"""
         logger.info("Checking for missing searchable snapshots and restoring them")
         
-        existing_indices = {idx['index'] for idx in self.get_indices()}
+        # Built once; every snapshot below checks membership against it in O(1)
+        existing_indices = frozenset(idx['index'] for idx in self.get_indices())
         restored_count = 0
         
-        for snapshot in self.get_snapshots():
-            if snapshot["status"] != "SUCCESS":
-                continue
-            
+        # Failed or partial snapshots are never restored, so drop them before any age or detail lookups
+        successful_snapshots = [snapshot for snapshot in self.get_snapshots() if snapshot["status"] == "SUCCESS"]
+        candidate_snapshots = []
+        for snapshot in successful_snapshots:
             # Check snapshot age - skip if too old or too young
             snapshot_age = self._snapshot_age_days(snapshot)
             if snapshot_age < 0:
@@ -124,15 +118,17 @@ class Ilm:
                 logger.info(f"Skipping snapshot {snapshot['id']} - too young ({snapshot_age:.1f} < {self.hot_storage_days} days)")
                 continue
                 
-            snapshot_name = snapshot['id']
-            
-            # Get snapshot details to see what indices it contains
+            candidate_snapshots.append(snapshot['id'])
+
+        # Get snapshot details to see what indices each candidate contains, batched instead of one GET per snapshot
+        indices_by_snapshot = self._get_snapshot_indices(candidate_snapshots)
+
+        for snapshot_name in candidate_snapshots:
+            snapshot_indices = indices_by_snapshot.get(snapshot_name)
+            if not snapshot_indices:
+                continue
+
             try:
-                details = self.requests.get(f"{self.base_url}/_snapshot/data/{snapshot_name}").json()
-                if not details.get("snapshots"):
-                    continue
-                    
-                snapshot_indices = details["snapshots"][0]["indices"]
                 should_restore = False
                 logger.debug(f"Checking snapshot {snapshot_name} with {len(snapshot_indices)} indices: {snapshot_indices}")
                 
@@ -161,7 +157,7 @@ class Ilm:
                 
                 if should_restore:
                     logger.info(f"Restoring missing searchable snapshot from snapshot {snapshot_name}")
-                    self._restore_as_searchable(snapshot_name, existing_indices)
+                    self._restore_as_searchable(snapshot_name, existing_indices, snapshot_indices)
                     restored_count += 1
                         
             except Exception as e:
@@ -207,7 +203,24 @@ class Ilm:
     # === PUBLIC UTILITY METHODS ===
 
     def get_indices(self) -> List[Dict[str, Any]]:
-        """Get all indices"""
+        """Get all indices, reusing the listing fetched earlier in this sweep"""
+        if self._indices_cache is None:
+            self._indices_cache = self._fetch_indices()
+        return self._indices_cache
+
+    def get_snapshots(self) -> List[Dict[str, Any]]:
+        """Get all snapshots, reusing the listing fetched earlier in this sweep"""
+        if self._snapshots_cache is None:
+            self._snapshots_cache = self._fetch_snapshots()
+        return self._snapshots_cache
+
+    def invalidate_cache(self) -> None:
+        """Drop cached index and snapshot listings so the next lookup hits the cluster"""
+        self._indices_cache = None
+        self._snapshots_cache = None
+
+    def _fetch_indices(self) -> List[Dict[str, Any]]:
+        """Fetch all indices from the cluster"""
         logger.debug("Fetching all indices via API")
         try:
             response = self.requests.get(f"{self.base_url}/_cat/indices?format=json")
@@ -219,8 +232,8 @@ class Ilm:
             logger.error(f"Failed to fetch indices: {e}")
             return []
     
-    def get_snapshots(self) -> List[Dict[str, Any]]:
-        """Get all snapshots"""
+    def _fetch_snapshots(self) -> List[Dict[str, Any]]:
+        """Fetch all snapshots from the cluster"""
         logger.debug("Fetching all snapshots via API")
         try:
             response = self.requests.get(f"{self.base_url}/_cat/snapshots/data?v&s=endEpoch&format=json", timeout=3600)
@@ -315,6 +328,7 @@ class Ilm:
     def _create_snapshot(self, index_name: str) -> bool:
         """Create snapshot of index with polling"""
         body = {"indices": [index_name], "partial": False}
+        self.invalidate_cache()
         
         # Create snapshot without waiting for completion
         response = self.requests.put(
@@ -482,6 +496,7 @@ class Ilm:
             "index_settings": {"index.number_of_replicas": 0}
         }
         
+        self.invalidate_cache()
         response = self.requests.post(f"{self.base_url}/_snapshot/data/{index_name}/_restore", json=body)
         if response.status_code == 200:
             logger.info(f"Mounted snapshot as searchable index: {searchable_name}")
@@ -490,14 +505,46 @@ class Ilm:
             logger.error(f"Failed to mount snapshot as searchable index: {searchable_name} (HTTP {response.status_code}) - Response: {response.text}")
             return False
 
-    def _restore_as_searchable(self, snapshot_name: str, existing_indices: set = None) -> None:
+    def _get_snapshot_indices(self, snapshot_names: List[str], batch_size: int = 100) -> Dict[str, List[str]]:
+        """Map snapshot names to the indices they contain, fetching details in comma-separated batches"""
+        indices_by_snapshot = {}
+        for batch in self._batch_snapshot_names(snapshot_names, batch_size):
+            details = self._fetch_snapshot_details(batch)
+            if details is None and len(batch) > 1:
+                # One bad name fails the whole batch, so ask for each snapshot on its own
+                logger.warning(f"Batched details request for {len(batch)} snapshots failed, fetching them individually")
+                details = []
+                for snapshot_name in batch:
+                    details.extend(self._fetch_snapshot_details([snapshot_name]) or [])
+            for snapshot_details in details or []:
+                indices_by_snapshot[snapshot_details["snapshot"]] = snapshot_details.get("indices", [])
+        return indices_by_snapshot
+
+    def _fetch_snapshot_details(self, snapshot_names: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """GET the details of the given snapshots in one request; None when the request fails"""
+        try:
+            response = self.requests.get(
+                f"{self.base_url}/_snapshot/data/{','.join(snapshot_names)}?ignore_unavailable=true"
+            )
+            if response.status_code != 200:
+                logger.error(f"Error getting details for snapshots {', '.join(snapshot_names)}: HTTP {response.status_code} - Response: {response.text}")
+                return None
+            return response.json().get("snapshots", [])
+        except Exception as e:
+            logger.error(f"Error getting details for snapshots {', '.join(snapshot_names)}: {e}")
+            return None
+
+    def _restore_as_searchable(self, snapshot_name: str, existing_indices: Optional[frozenset] = None,
+                               snapshot_indices: Optional[List[str]] = None) -> None:
         """Restore snapshot as searchable snapshot"""
         try:
-            details = self.requests.get(f"{self.base_url}/_snapshot/data/{snapshot_name}").json()
+            if snapshot_indices is None:
+                details = self.requests.get(f"{self.base_url}/_snapshot/data/{snapshot_name}").json()
+                snapshot_indices = details["snapshots"][0]["indices"]
             if existing_indices is None:
-                existing_indices = {idx['index'] for idx in self.get_indices()}
+                existing_indices = frozenset(idx['index'] for idx in self.get_indices())
             
-            for index_name in details["snapshots"][0]["indices"]:
+            for index_name in snapshot_indices:
                 if index_name.startswith(".ds"):
                     continue
                     
@@ -513,6 +560,7 @@ class Ilm:
                     "index_settings": {"index.number_of_replicas": 0}
                 }
                 
+                self.invalidate_cache()
                 response = self.requests.post(f"{self.base_url}/_snapshot/data/{snapshot_name}/_restore", json=body)
                 if response.status_code == 200:
                     logger.info(f"Mounted snapshot as searchable index: {searchable_name}")
@@ -521,6 +569,86 @@ class Ilm:
         except Exception as e:
             logger.error(f"Error restoring snapshot {snapshot_name}: {e}")
 
+    # === PRIVATE CLEANUP PHASES ===
+
+    def _delete_expired_searchable_indices(self, indices: List[Dict[str, Any]], snapshots: List[Dict[str, Any]]) -> None:
+        """Phase 1: delete searchable snapshot indices whose snapshot is older than retention"""
+        logger.info("Phase 1: Deleting expired searchable snapshot indices (mounted snapshots)...")
+        expired_searchable_indices = []
+        for index_info in indices:
+            index_name = index_info['index']
+            if index_name.endswith('-snapshot'):
+                # Extract base index name to check if it should be managed
+                base_index_name = index_name.replace('-snapshot', '')
+                if self._should_manage_index(base_index_name):
+                    age_days = self._get_searchable_snapshot_age_days(index_name, snapshots)
+                    if age_days >= self.total_retention_days:
+                        logger.info(f"Deleting old searchable snapshot index {index_name} ({age_days:.1f} days old)")
+                        expired_searchable_indices.append(index_name)
+
+        # Deletions are independent, so fan them out; leaving the executor waits for all of them
+        if expired_searchable_indices:
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_INDEX_DELETES) as executor:
+                list(executor.map(self._delete_index, expired_searchable_indices))
+
+    def _delete_expired_regular_indices(self, indices: List[Dict[str, Any]]) -> List[str]:
+        """Phase 2: delete regular managed indices older than retention, returning their snapshots for phase 3"""
+        logger.info("Phase 2: Deleting expired regular indices and their backing snapshots...")
+        expired_snapshots = []
+        for index_info in indices:
+            index_name = index_info['index']
+            if not self._should_manage_index(index_name):
+                continue
+            if index_name.endswith('-snapshot'):  # Skip searchable snapshots, handled in phase 1
+                continue
+                
+            age_days = self._get_index_age_days(index_name)
+            if age_days >= self.total_retention_days:
+                logger.info(f"Deleting old index {index_name} ({age_days:.1f} days old)")
+                self._delete_index(index_name)
+                
+                # Also delete corresponding snapshot, batched with phase 3
+                corresponding_snapshot = self._get_corresponding_snapshot_name(index_name)
+                if corresponding_snapshot:
+                    logger.info(f"Deleting corresponding snapshot {corresponding_snapshot}")
+                    expired_snapshots.append(corresponding_snapshot)
+        return expired_snapshots
+
+    def _delete_expired_snapshots(self, expired_snapshots: List[str], mounted_indices: frozenset = frozenset()) -> None:
+        """Phase 3: bulk delete snapshots past retention together with those queued by phase 2"""
+        logger.info("Phase 3: Cleaning up orphaned snapshots and their mounted indices...")
+        expired_snapshots = list(expired_snapshots)
+        snapshots = self.get_snapshots()  # Served from cache unless phases 1-2 deleted something
+        for snapshot in snapshots:
+            snapshot_age = self._snapshot_age_days(snapshot)
+            
+            # Skip snapshots with unknown ages
+            if snapshot_age < 0:
+                logger.debug(f"Snapshot {snapshot['id']} has unknown age; skipping age-based deletion")
+                continue
+            
+            # Sanity check for unreasonable ages
+            if snapshot_age >= 20000:  # ~55 years
+                logger.warning(
+                    f"Snapshot {snapshot['id']} computed age={snapshot_age:.1f}d — likely missing/zero end_epoch; "
+                    f"verify snapshot state and fields (endEpoch/startEpoch)"
+                )
+                continue
+                
+            if snapshot_age >= self.total_retention_days:
+                logger.info(f"Deleting old snapshot {snapshot['id']} ({snapshot_age:.1f} days old)")
+                expired_snapshots.append(snapshot['id'])
+
+        # A phase 2 snapshot is usually past retention itself, so drop duplicates before the single bulk delete
+        deletable_snapshots = []
+        for snapshot_name in dict.fromkeys(expired_snapshots):
+            searchable_name = f"{snapshot_name}-snapshot"
+            if searchable_name in mounted_indices and self._index_exists(searchable_name):
+                logger.warning(f"Keeping snapshot {snapshot_name}: still mounted as {searchable_name}")
+                continue
+            deletable_snapshots.append(snapshot_name)
+        self._bulk_delete_snapshots(deletable_snapshots)
+
     # === PRIVATE ROLLOVER OPERATIONS ===
 
     def _rollover_alias(self, alias_name: str) -> bool:
@@ -536,6 +664,8 @@ class Ilm:
         if response.status_code == 200:
             result = response.json()
             if result.get('rolled_over'):
+                self.invalidate_cache()
+                self._write_index_map = None
                 old = result.get('old_index')
                 new = result.get('new_index')
                 logger.info(f"Rolled over: {old} -> {new}")
@@ -590,6 +720,7 @@ class Ilm:
     
     def _delete_index(self, index_name: str) -> None:
         """Delete index"""
+        self.invalidate_cache()
         response = self.requests.delete(f"{self.base_url}/{index_name}")
         if response.status_code == 200:
             logger.info(f"Deleted index: {index_name}")
@@ -600,6 +731,7 @@ class Ilm:
     
     def _delete_snapshot(self, snapshot_name: str) -> None:
         """Delete snapshot"""
+        self.invalidate_cache()
         response = self.requests.delete(f"{self.base_url}/_snapshot/data/{snapshot_name}")
         if response.status_code == 200:
             logger.info(f"Deleted snapshot: {snapshot_name}")
@@ -608,17 +740,43 @@ class Ilm:
         else:
             logger.error(f"Failed to delete snapshot {snapshot_name} (HTTP {response.status_code}) - Response: {response.text}")
 
-    def _delete_snapshot_with_cleanup(self, snapshot_name: str) -> None:
-        """Delete snapshot, handling searchable snapshots by removing backing indices first"""
-        # Check if this is a searchable snapshot (ends with -snapshot)
-        if snapshot_name.endswith("-snapshot"):
-            # For searchable snapshots, delete the backing index first
-            if self._index_exists(snapshot_name):
+    def _bulk_delete_snapshots(self, snapshot_names: List[str], batch_size: int = 100) -> None:
+        """Delete snapshots in comma-separated batches, removing searchable snapshot indices first"""
+        for snapshot_name in snapshot_names:
+            if snapshot_name.endswith("-snapshot") and self._index_exists(snapshot_name):
                 logger.info(f"Removing searchable snapshot index before deleting snapshot: {snapshot_name}")
                 self._delete_index(snapshot_name)
-        
-        # Now delete the snapshot
-        self._delete_snapshot(snapshot_name)
+
+        for batch in self._batch_snapshot_names(snapshot_names, batch_size):
+            self.invalidate_cache()
+            response = self.requests.delete(f"{self.base_url}/_snapshot/data/{','.join(batch)}")
+            if response.status_code == 200:
+                logger.info(f"Deleted {len(batch)} snapshots: {', '.join(batch)}")
+            elif len(batch) > 1:
+                # One missing, still mounted or busy snapshot fails the whole request, so retry each snapshot on its own
+                logger.warning(f"Bulk delete of {len(batch)} snapshots failed (HTTP {response.status_code}), deleting them individually")
+                for snapshot_name in batch:
+                    self._delete_snapshot(snapshot_name)
+            elif response.status_code == 404:
+                logger.debug(f"Snapshot {batch[0]} already deleted or does not exist")
+            else:
+                logger.error(f"Failed to delete snapshot {batch[0]} (HTTP {response.status_code}) - Response: {response.text}")
+
+    def _batch_snapshot_names(self, snapshot_names: List[str], batch_size: int) -> List[List[str]]:
+        """Split snapshot names into batches of at most batch_size names and MAX_SNAPSHOT_NAMES_URL_LENGTH joined characters"""
+        batches = []
+        batch: List[str] = []
+        batch_length = 0
+        for snapshot_name in snapshot_names:
+            joined_length = batch_length + len(snapshot_name) + (1 if batch else 0)
+            if batch and (len(batch) >= batch_size or joined_length > MAX_SNAPSHOT_NAMES_URL_LENGTH):
+                batches.append(batch)
+                batch, joined_length = [], len(snapshot_name)
+            batch.append(snapshot_name)
+            batch_length = joined_length
+        if batch:
+            batches.append(batch)
+        return batches
 
 
     # === PRIVATE QUERY/VALIDATION METHODS ===
@@ -645,6 +803,31 @@ class Ilm:
 
     def _is_write_index(self, index_name: str) -> bool:
         """Check if index is currently a write index"""
+        if self._write_index_map is None:
+            self._write_index_map = self._fetch_write_index_map()
+        if index_name in self._write_index_map:
+            return self._write_index_map[index_name]
+        # Not in this sweep's alias map (e.g. created after it was fetched): ask the cluster directly
+        return self._fetch_is_write_index(index_name)
+
+    def _fetch_write_index_map(self) -> Dict[str, bool]:
+        """Fetch the write-index flag of every index with a single GET /_alias"""
+        try:
+            response = self.requests.get(f"{self.base_url}/_alias")
+            if response.status_code != 200:
+                logger.error(f"Error getting aliases: HTTP {response.status_code} - Response: {response.text}")
+                return {}
+
+            return {
+                index_name: any(config.get('is_write_index', False) for config in index_data.get('aliases', {}).values())
+                for index_name, index_data in response.json().items()
+            }
+        except Exception as e:
+            logger.error(f"Error getting write indices: {e}")
+            return {}
+
+    def _fetch_is_write_index(self, index_name: str) -> bool:
+        """Check a single index's aliases for the write index flag"""
         try:
             response = self.requests.get(f"{self.base_url}/{index_name}/_alias")
             if response.status_code != 200:
@@ -662,16 +845,42 @@ class Ilm:
     def _is_searchable_snapshot(self, index_name: str) -> bool:
         """Check if index is a searchable snapshot"""
         try:
-            response = self.requests.get(f"{self.base_url}/{index_name}/_settings")
-            if response.status_code != 200:
-                return False
-            settings = response.json()
-            store_type = settings[index_name]["settings"]["index"].get("store", {}).get("type")
+            index_settings = self._get_cached_index_settings(index_name)
+            if index_settings is None:
+                response = self.requests.get(f"{self.base_url}/{index_name}/_settings")
+                if response.status_code != 200:
+                    return False
+                index_settings = response.json()[index_name]["settings"]["index"]
+            store_type = index_settings.get("store", {}).get("type")
             return store_type == "remote_snapshot"
         except Exception as e:
             logger.debug(f"Error checking if {index_name} is searchable snapshot: {e}")
             return False
 
+    def _get_cached_index_settings(self, index_name: str) -> Optional[Dict[str, Any]]:
+        """Get index settings from this sweep's settings map; None when the map does not cover the index"""
+        if self._index_settings_map is None:
+            self._index_settings_map = self._fetch_index_settings_map()
+        return self._index_settings_map.get(index_name)
+
+    def _fetch_index_settings_map(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch the creation date and store type of every index with a single GET /_settings"""
+        try:
+            response = self.requests.get(
+                f"{self.base_url}/_settings?filter_path=*.settings.index.creation_date,*.settings.index.store.type"
+            )
+            if response.status_code != 200:
+                logger.warning(f"Error getting index settings, falling back to per-index lookups: HTTP {response.status_code} - Response: {response.text}")
+                return {}
+
+            return {
+                index_name: index_data.get("settings", {}).get("index", {})
+                for index_name, index_data in response.json().items()
+            }
+        except Exception as e:
+            logger.warning(f"Error getting index settings, falling back to per-index lookups: {e}")
+            return {}
+
     def _snapshot_age_days(self, snap: Dict[str, Any]) -> float:
         """
         Compute snapshot age in days; robust to missing/zero end time.
@@ -722,12 +931,14 @@ class Ilm:
     def _get_index_age_days(self, index_name: str) -> float:
         """Get index age in days with defensive handling of future timestamps"""
         try:
-            response = self.requests.get(f"{self.base_url}/{index_name}/_settings")
-            if response.status_code != 200:
-                logger.error(f"Error getting settings for {index_name}: HTTP {response.status_code} - Response: {response.text}")
-                return 0
-            settings = response.json()
-            created_ms = int(settings[index_name]["settings"]["index"]["creation_date"])
+            index_settings = self._get_cached_index_settings(index_name)
+            if index_settings is None:
+                response = self.requests.get(f"{self.base_url}/{index_name}/_settings")
+                if response.status_code != 200:
+                    logger.error(f"Error getting settings for {index_name}: HTTP {response.status_code} - Response: {response.text}")
+                    return 0
+                index_settings = response.json()[index_name]["settings"]["index"]
+            created_ms = int(index_settings["creation_date"])
             age_seconds = time.time() - (created_ms / 1000)
 
             # Defensive handling for future timestamps
@@ -837,5 +1048,8 @@ class Ilm:
             
         if not self.managed_index_patterns:
             raise ValueError("At least one managed index pattern must be specified")
+
+        if self.max_transitions_per_cycle <= 0:
+            raise ValueError(f"Max transitions per cycle must be > 0, got {self.max_transitions_per_cycle}")
             
-        logger.info(f"ILM configuration validated: hot_storage={self.hot_storage_days}d, total_retention={self.total_retention_days}d, rollover_size={self.rollover_size_gb}GB, rollover_age={self.rollover_age_days}d, patterns={self.managed_index_patterns}")
\ No newline at end of file
+        logger.info(f"ILM configuration validated: hot_storage={self.hot_storage_days}d, total_retention={self.total_retention_days}d, rollover_size={self.rollover_size_gb}GB, rollover_age={self.rollover_age_days}d, patterns={self.managed_index_patterns}, max_transitions_per_cycle={self.max_transitions_per_cycle}")
\ No newline at end of file
@@ -3,9 +3,22 @@ import glob
 import yaml
 import json
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 from settings import Settings
 
+# libyaml's C loader parses considerably faster; fall back to the pure-Python loader when it isn't built in
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Upper bound on concurrent PUT requests when syncing pipelines to the cluster
+MAX_PARALLEL_PIPELINE_UPLOADS = 8
+
+# Serialized pipelines per file path, reused by later syncs while the file's (mtime_ns, size) is unchanged
+_pipeline_json_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
 class IngestPipelineManager:
 
     """
@@ -19,20 +32,35 @@ class IngestPipelineManager:
     def _read_yaml(self, file_path: str) -> Dict[str, Any]:
         """Reads a YAML file and returns its contents as a Python dictionary."""
         with open(file_path, 'r') as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=SafeLoader)
+
+    def _read_pipeline_json(self, file_path: str) -> str:
+        """Returns a pipeline YAML file as a JSON string, skipping the YAML parse when the file is unchanged."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return json.dumps(self._read_yaml(file_path))
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _pipeline_json_cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        json_data = json.dumps(self._read_yaml(file_path))
+        _pipeline_json_cache[file_path] = (signature, json_data)
+        return json_data
 
     def _upload_json(self, json_data: str, pipeline_name: str) -> int:
         """Uploads a JSON string to an OpenSearch pipeline."""
         headers = {'Content-Type': 'application/json'}
         # dry run, output to console
         print(f"Uploading pipeline {pipeline_name}")
-        response = self.requests.put(f"{self.base_url}/_ingest/pipeline/{pipeline_name}", data=json_data)
+        # Defensive: sync_to_cluster's json.dumps output is pure ASCII, but encoding keeps non-ASCII str bodies from other callers UTF-8
+        response = self.requests.put(f"{self.base_url}/_ingest/pipeline/{pipeline_name}", data=json_data.encode("utf-8"))
+        # One print per outcome, naming the pipeline, so lines from concurrent uploads don't interleave anonymously
         if response.status_code != requests.codes.ok:
-            print('Error uploading pipeline to OpenSearch.')
-            print('Status code:', response.status_code)
-            print('Response text:', response.text)
+            print(f"Error uploading pipeline {pipeline_name} to OpenSearch. "
+                  f"Status code: {response.status_code}, response text: {response.text}")
         else:
-            print('Pipeline uploaded successfully.')
+            print(f"Pipeline {pipeline_name} uploaded successfully.")
         return response.status_code
 
     def sync_to_cluster(self, directory: str) -> None:
@@ -41,8 +69,12 @@ class IngestPipelineManager:
         print(f"Syncing ingest pipelines from {directory}")
 
         yml_files = glob.glob(os.path.join(directory, '*.yml'))
+        uploads = []
         for yml_file in yml_files:
             base_name = os.path.basename(yml_file)[:-4]  # Strip .yml extension
-            yaml_data = self._read_yaml(yml_file)
-            json_data = json.dumps(yaml_data)
-            self._upload_json(json_data, base_name)
\ No newline at end of file
+            uploads.append((self._read_pipeline_json(yml_file), base_name))
+
+        # Pipelines are independent, so overlap the round-trips; leaving the executor waits for all of them
+        if uploads:
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_PIPELINE_UPLOADS) as executor:
+                list(executor.map(lambda upload: self._upload_json(*upload), uploads))
@@ -227,6 +227,7 @@ if __name__ == "__main__":
     rollover_age_days: int = int(os.getenv("ROLLOVER_AGE_DAYS", "30"))
     managed_index_patterns_str: str = os.getenv("MANAGED_INDEX_PATTERNS", "log,alert")
     managed_index_patterns: tuple = tuple(pattern.strip() for pattern in managed_index_patterns_str.split(","))
+    max_transitions_per_cycle: int = int(os.getenv("MAX_TRANSITIONS_PER_CYCLE", "50"))
     snapshotname: Optional[str] = args.snapshotname
     repository_data: Optional[str] = os.getenv("REPOSITORY_DATA")
     
@@ -235,7 +236,7 @@ if __name__ == "__main__":
     teams_webhook_url: Optional[str] = os.getenv("TEAMS_WEBHOOK_URL")
     health_check_interval: int = int(os.getenv("HEALTH_CHECK_INTERVAL", "300"))
 
-    print(f"URL: {url}\nBucket: {bucket}\nCert file path: {cert_file_path}\nKey file path: {key_file_path}\nNumber of days on hot storage: {number_of_days_on_hot_storage}\nNumber of days total retention: {number_of_days_total_retention}\nRollover size: {rollover_size_gb}GB\nRollover age: {rollover_age_days} days\nManaged index patterns: {managed_index_patterns}\nSnapshot name: {snapshotname}")
+    print(f"URL: {url}\nBucket: {bucket}\nCert file path: {cert_file_path}\nKey file path: {key_file_path}\nNumber of days on hot storage: {number_of_days_on_hot_storage}\nNumber of days total retention: {number_of_days_total_retention}\nRollover size: {rollover_size_gb}GB\nRollover age: {rollover_age_days} days\nManaged index patterns: {managed_index_patterns}\nMax transitions per cycle: {max_transitions_per_cycle}\nSnapshot name: {snapshotname}")
     print(f"Health monitoring enabled: {health_monitoring_enabled}")
     if teams_webhook_url:
         print(f"Teams webhook configured: {teams_webhook_url[:50]}...")
@@ -260,7 +261,8 @@ if __name__ == "__main__":
         repository=repository_data,  # type: ignore
         rollover_size_gb=rollover_size_gb,
         rollover_age_days=rollover_age_days,
-        managed_index_patterns=managed_index_patterns
+        managed_index_patterns=managed_index_patterns,
+        max_transitions_per_cycle=max_transitions_per_cycle
     )
     
     if not action:
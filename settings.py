@@ -1,9 +1,13 @@
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Tuple
 
+# Keep-alive connections pooled per host; sized above the parallel delete/upload workers so none are discarded
+CONNECTION_POOL_SIZE = 16
+
 class Settings:
 
-    def __init__(self, url: str, bucket: str, cert_file_path: str, key_file_path: str, number_of_days_on_hot_storage: int, number_of_days_total_retention: int, repository: str, rollover_size_gb: int = 50, rollover_age_days: int = 30, managed_index_patterns: Tuple[str, ...] = ("log", "alert")) -> None:
+    def __init__(self, url: str, bucket: str, cert_file_path: str, key_file_path: str, number_of_days_on_hot_storage: int, number_of_days_total_retention: int, repository: str, rollover_size_gb: int = 50, rollover_age_days: int = 30, managed_index_patterns: Tuple[str, ...] = ("log", "alert"), max_transitions_per_cycle: int = 50) -> None:
         self.url: str = url
         self.bucket: str = bucket
         self.number_of_days_on_hot_storage: int = number_of_days_on_hot_storage
@@ -14,6 +18,7 @@ class Settings:
         self.rollover_size_gb: int = rollover_size_gb
         self.rollover_age_days: int = rollover_age_days
         self.managed_index_patterns: Tuple[str, ...] = managed_index_patterns
+        self.max_transitions_per_cycle: int = max_transitions_per_cycle
     
     def get_requests_object(self) -> requests.Session:
         cert: Tuple[str, str] = (self.cert_file_path, self.key_file_path)
@@ -21,4 +26,7 @@ class Settings:
         s.cert = cert
         s.verify = False
         s.headers = {"content-type": "application/json", 'charset':'UTF-8'}
+        adapter = HTTPAdapter(pool_maxsize=CONNECTION_POOL_SIZE)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
         return s
\ No newline at end of file
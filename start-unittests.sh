@@ -1,3 +1,3 @@
 #!/bin/sh
 
-python -m unittest discover -s test
\ No newline at end of file
+python -m pytest "$@"
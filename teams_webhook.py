@@ -1,5 +1,4 @@
 import requests
-import json
 import time
 from typing import Optional, Dict, Any
 from loguru import logger
@@ -133,8 +132,7 @@ class TeamsWebhook:
                 
                 response = requests.post(
                     self.webhook_url,
-                    headers={"Content-Type": "application/json"},
-                    data=json.dumps(payload),
+                    json=payload,
                     timeout=10
                 )
                 
@@ -0,0 +1,22 @@
+import time
+
+import pytest
+
+from test.helpers import FROZEN_NOW, FakeSettings
+
+
+def pytest_configure(config):
+    # Registered here too so the mark is known when pytest-xdist is not installed
+    config.addinivalue_line("markers", "xdist_group(name): run tests sharing module fixtures on one xdist worker")
+
+
+@pytest.fixture(scope="session")
+def make_settings():
+    """Build a FakeSettings, overriding any defaults by keyword"""
+    return FakeSettings
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Pin the clock so test timestamps and Ilm age calculations share one now"""
+    monkeypatch.setattr(time, "time", lambda: FROZEN_NOW)
@@ -28,6 +28,6 @@ class BaseHealthTest(unittest.TestCase):
         mock_response = Mock()
         mock_response.json.return_value = json_data
         mock_response.status_code = 200
-        mock_response.text = '{"test": "response"}'
+        mock_response.content = b'{"test": "response"}'
         mock_response.raise_for_status.return_value = None
         return mock_response
\ No newline at end of file
@@ -212,7 +212,7 @@ class TestCircuitBreakerMonitoring(BaseHealthTest):
         """Test circuit breaker check when API call fails"""
         mock_response = Mock()
         mock_response.status_code = 500
-        mock_response.text = '{"error": "server error"}'
+        mock_response.content = b'{"error": "server error"}'
         mock_response.raise_for_status.side_effect = Exception("API connection failed")
         self.session.get.return_value = mock_response
         
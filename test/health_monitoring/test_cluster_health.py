@@ -169,6 +169,7 @@ class TestClusterHealthMonitoring(BaseHealthTest):
     def test_cluster_health_error(self):
         """Test cluster health check when API call fails"""
         mock_response = Mock()
+        mock_response.content = b'{"error": "server error"}'
         mock_response.raise_for_status.side_effect = Exception("Connection failed")
         self.session.get.return_value = mock_response
         
@@ -87,6 +87,7 @@ class TestJVMHeapMonitoring(BaseHealthTest):
     def test_jvm_heap_usage_api_error(self):
         """Test JVM heap usage check when API call fails"""
         mock_response = Mock()
+        mock_response.content = b'{"error": "server error"}'
         mock_response.raise_for_status.side_effect = Exception("API connection failed")
         self.session.get.return_value = mock_response
         
@@ -0,0 +1,39 @@
+"""Plain test helpers shared across modules; fixtures and hooks stay in conftest.py"""
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+# Frozen clock for the ILM age tests (Sept 15, 2025 12:00:00 GMT); opt in with the frozen_time fixture
+FROZEN_NOW = 1757949600
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class FakeSettings:
+    """The Settings attributes the managers read, plus the requests object they fetch once at construction"""
+    requests_object: object = None
+    url: str = "https://test-opensearch:9200"
+    bucket: str = "test-bucket"
+    repository: str = "data"
+    number_of_days_on_hot_storage: int = 7
+    number_of_days_total_retention: int = 90
+    rollover_size_gb: int = 50
+    rollover_age_days: int = 30
+    managed_index_patterns: tuple = ("log-", "alert-")
+    max_transitions_per_cycle: int = 50
+
+    def get_requests_object(self):
+        return self.requests_object
+
+
+def _response(status_code=200, json=None, text=""):
+    """Build a read-only requests-like response; no test inspects calls on it"""
+    return SimpleNamespace(status_code=status_code, json=lambda: json, text=text)
+
+
+def _stub(ilm, **methods):
+    """Install stubs over existing Ilm methods in one __dict__ update"""
+    # Like a spec_set autospec, a misspelled or removed method name fails instead of silently passing
+    unknown = sorted(name for name in methods if not hasattr(type(ilm), name))
+    assert not unknown, f"Ilm has no attribute(s) {unknown}"
+    vars(ilm).update(methods)
+    return ilm
@@ -1,31 +1,61 @@
 #!/usr/bin/env python3
 
-import unittest
-import time
-from unittest.mock import Mock, MagicMock, patch
-import sys
-import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from unittest.mock import Mock, MagicMock
 
 from ilm import Ilm
 from settings import Settings
-
-
-class TestIlmAgeCalculation(unittest.TestCase):
+from test.helpers import FROZEN_NOW, SECONDS_PER_DAY, _response
+
+
+# (days_ago, creation_timestamp_ms, expected_ready, description) relative to FROZEN_NOW
+READY_FOR_SNAPSHOT_CASES = [
+    (days_ago, (FROZEN_NOW - days_ago * SECONDS_PER_DAY) * 1000, expected_ready, description)
+    for days_ago, expected_ready, description in [
+        (15, True, "15-day-old index should be ready (> 7 days)"),
+        (10, True, "10-day-old index should be ready (> 7 days)"),
+        (7, True, "7-day-old index should be ready (= 7 days)"),
+        (5, False, "5-day-old index should not be ready (< 7 days)"),
+        (1, False, "1-day-old index should not be ready (< 7 days)"),
+    ]
+]
+
+
+def _settings_response(index_name, creation_date):
+    """Build a read-only _settings response; these tests never inspect calls on it."""
+    payload = {index_name: {"settings": {"index": {"creation_date": str(creation_date)}}}}
+    return _response(200, payload)
+
+
+@pytest.fixture(scope="module")
+def settings_template():
+    """Settings mock shared by the module; Ilm only reads it during construction."""
+    mock_settings = Mock(spec=Settings)
+    mock_settings.url = "https://test-opensearch:9200"
+    mock_settings.number_of_days_on_hot_storage = 7
+    mock_settings.number_of_days_total_retention = 90
+    mock_settings.rollover_size_gb = 50
+    mock_settings.rollover_age_days = 30
+    mock_settings.managed_index_patterns = ("log-", "alert-")
+    mock_settings.max_transitions_per_cycle = 50
+    return mock_settings
+
+
+@pytest.mark.usefixtures("frozen_time")
+class TestIlmAgeCalculation:
     """Unit tests for ILM age calculation logic with edge cases"""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        self.mock_settings.number_of_days_on_hot_storage = 7
-        self.mock_settings.number_of_days_total_retention = 90
-        self.mock_settings.rollover_size_gb = 50
-        self.mock_settings.rollover_age_days = 30
-        self.mock_settings.managed_index_patterns = ("log-", "alert-")
-
+    @pytest.fixture
+    def mock_logger(self, monkeypatch):
+        """Replace the ilm module logger with a plain Mock"""
+        mock = Mock()
+        monkeypatch.setattr("ilm.logger", mock)
+        return mock
+
+    @pytest.fixture(autouse=True)
+    def setup_ilm(self, settings_template):
+        """Give each test a fresh requests mock and Ilm on top of the shared settings."""
+        self.mock_settings = settings_template
         self.mock_requests = Mock()
         self.mock_settings.get_requests_object.return_value = self.mock_requests
 
@@ -35,133 +65,88 @@ class TestIlmAgeCalculation(unittest.TestCase):
         """Test normal age calculation for indices"""
         # Create a timestamp for 45 days ago
         days_ago = 45
-        creation_timestamp_ms = int((time.time() - (days_ago * 24 * 60 * 60)) * 1000)
-
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "log-normal-000001": {
-                "settings": {
-                    "index": {
-                        "creation_date": str(creation_timestamp_ms)
-                    }
-                }
-            }
-        }
-        self.mock_requests.get.return_value = mock_response
+        creation_timestamp_ms = (FROZEN_NOW - days_ago * SECONDS_PER_DAY) * 1000
+
+        self.mock_requests.get.return_value = _settings_response("log-normal-000001", creation_timestamp_ms)
 
         age_days = self.ilm._get_index_age_days("log-normal-000001")
 
-        # Allow for small timing differences in test execution
-        self.assertAlmostEqual(age_days, days_ago, delta=0.1,
-                              msg=f"Age should be approximately {days_ago} days")
+        assert age_days == days_ago, f"Age should be exactly {days_ago} days"
 
-    def test_age_calculation_future_timestamp_case(self):
+    def test_age_calculation_future_timestamp_case(self, mock_logger):
         """Test age calculation for index with actual future timestamp"""
         # Create a timestamp 10 days in the future
-        future_timestamp_ms = int((time.time() + (10 * 24 * 60 * 60)) * 1000)
-
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "log-future-000001": {
-                "settings": {
-                    "index": {
-                        "creation_date": str(future_timestamp_ms)
-                    }
-                }
-            }
-        }
-        self.mock_requests.get.return_value = mock_response
-
-        with patch('ilm.logger') as mock_logger:
-            age_days = self.ilm._get_index_age_days("log-future-000001")
+        future_timestamp_ms = (FROZEN_NOW + 10 * SECONDS_PER_DAY) * 1000
+
+        self.mock_requests.get.return_value = _settings_response("log-future-000001", future_timestamp_ms)
+
+        age_days = self.ilm._get_index_age_days("log-future-000001")
 
         # Should return 0 for future timestamps
-        self.assertEqual(age_days, 0, "Future timestamps should return 0 age")
+        assert age_days == 0, "Future timestamps should return 0 age"
 
         # Should log a warning
         mock_logger.warning.assert_called_once()
         warning_call = mock_logger.warning.call_args[0][0]
-        self.assertIn("future creation timestamp", warning_call)
-
-    def test_age_calculation_your_actual_timestamps(self):
-        """Test age calculation for your actual problematic timestamps (now in the past)"""
-        test_cases = [
-            # (timestamp_ms, description, expected_should_snapshot)
-            (1756834419619, "Sept 2, 2025 timestamp (13 days old)", True),   # Old enough for 7-day threshold
-            (1757535300048, "Sept 10, 2025 timestamp (5 days old)", False),   # Too young for 7-day threshold
+        assert "future creation timestamp" in warning_call
+
+    @pytest.mark.parametrize("timestamp_ms,min_age,max_age,expected_should_snapshot", [
+        (1756834419619, 7, None, True),   # Sept 2, 2025 (13 days old) - old enough for 7-day threshold
+        (1757535300048, None, 7, False),  # Sept 10, 2025 (5 days old) - too young for 7-day threshold
+    ], ids=["sept2-13d", "sept10-5d"])
+    def test_age_calculation_your_actual_timestamps(self, timestamp_ms, min_age, max_age, expected_should_snapshot):
+        """Test age calculation for your actual problematic timestamps (as seen on Sept 15, 2025)"""
+        self.mock_requests.get.return_value = _settings_response("test-index", timestamp_ms)
+
+        age_days = self.ilm._get_index_age_days("test-index")
+
+        # Should return actual age (not 0)
+        assert age_days > 0
+        if min_age is not None:
+            assert age_days > min_age
+        if max_age is not None:
+            assert age_days < max_age
+
+        # Test readiness for snapshot
+        self.ilm._is_write_index = Mock(return_value=False)
+        self.ilm._is_searchable_snapshot = Mock(return_value=False)
+
+        is_ready = self.ilm._is_ready_for_snapshot("test-index")
+        assert is_ready == expected_should_snapshot
+
+    def test_age_calculation_falls_back_for_unknown_index(self):
+        """Test that an index missing from the batched settings is looked up on its own"""
+        creation_timestamp_ms = (FROZEN_NOW - 20 * SECONDS_PER_DAY) * 1000
+        self.mock_requests.get.side_effect = [
+            _settings_response("log-other-000001", creation_timestamp_ms),
+            _settings_response("log-new-000001", creation_timestamp_ms),
         ]
 
-        for timestamp_ms, description, expected_should_snapshot in test_cases:
-            with self.subTest(timestamp=timestamp_ms):
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "test-index": {
-                        "settings": {
-                            "index": {
-                                "creation_date": str(timestamp_ms)
-                            }
-                        }
-                    }
-                }
-                self.mock_requests.get.return_value = mock_response
-
-                age_days = self.ilm._get_index_age_days("test-index")
-
-                # Should return actual age (not 0)
-                self.assertGreater(age_days, 0, f"{description} should have positive age")
-                # Age assertions based on actual timestamps
-                if "13 days" in description:
-                    self.assertGreater(age_days, 7, f"{description} should be greater than 7 days old")
-                elif "5 days" in description:
-                    self.assertLess(age_days, 7, f"{description} should be less than 7 days old")
-
-                # Test readiness for snapshot
-                self.ilm._is_write_index = Mock(return_value=False)
-                self.ilm._is_searchable_snapshot = Mock(return_value=False)
-
-                is_ready = self.ilm._is_ready_for_snapshot("test-index")
-                self.assertEqual(is_ready, expected_should_snapshot,
-                    f"{description} snapshot readiness should be {expected_should_snapshot}")
-
-    def test_age_calculation_api_error(self):
+        age_days = self.ilm._get_index_age_days("log-new-000001")
+
+        assert age_days == 20
+        assert self.mock_requests.get.call_args[0][0] == "https://test-opensearch:9200/log-new-000001/_settings"
+
+    def test_age_calculation_api_error(self, mock_logger):
         """Test age calculation when settings API fails"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.text = "Index not found"
-        self.mock_requests.get.return_value = mock_response
+        self.mock_requests.get.return_value = _response(404, text="Index not found")
 
-        with patch('ilm.logger') as mock_logger:
-            age_days = self.ilm._get_index_age_days("log-nonexistent-000001")
+        age_days = self.ilm._get_index_age_days("log-nonexistent-000001")
 
         # Should return 0 for failed API calls
-        self.assertEqual(age_days, 0, "Failed API calls should return 0 age")
+        assert age_days == 0, "Failed API calls should return 0 age"
 
         # Should log an error
         mock_logger.error.assert_called_once()
 
-    def test_age_calculation_malformed_timestamp(self):
+    def test_age_calculation_malformed_timestamp(self, mock_logger):
         """Test age calculation with malformed creation_date"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "log-malformed-000001": {
-                "settings": {
-                    "index": {
-                        "creation_date": "not-a-number"
-                    }
-                }
-            }
-        }
-        self.mock_requests.get.return_value = mock_response
-
-        with patch('ilm.logger') as mock_logger:
-            age_days = self.ilm._get_index_age_days("log-malformed-000001")
+        self.mock_requests.get.return_value = _settings_response("log-malformed-000001", "not-a-number")
+
+        age_days = self.ilm._get_index_age_days("log-malformed-000001")
 
         # Should return 0 for malformed timestamps
-        self.assertEqual(age_days, 0, "Malformed timestamps should return 0 age")
+        assert age_days == 0, "Malformed timestamps should return 0 age"
 
         # Should log a debug message
         mock_logger.debug.assert_called()
@@ -195,85 +180,34 @@ class TestIlmAgeCalculation(unittest.TestCase):
         # Verify that no indices were processed for snapshot due to future timestamps
         self.ilm._snapshot_and_replace_index.assert_not_called()
 
-    def test_ready_for_snapshot_with_correct_ages(self):
-        """Test snapshot readiness with time-resilient test logic"""
-        current_time = time.time()
-
-        test_cases = [
-            # (days_ago, expected_ready, description)
-            (15, True, "15-day-old index should be ready (> 7 days)"),
-            (10, True, "10-day-old index should be ready (> 7 days)"),
-            (7, True, "7-day-old index should be ready (= 7 days)"),
-            (5, False, "5-day-old index should not be ready (< 7 days)"),
-            (1, False, "1-day-old index should not be ready (< 7 days)"),
-        ]
-
-        for days_ago, expected_ready, description in test_cases:
-            with self.subTest(days_ago=days_ago):
-                # Create timestamp for specified days ago
-                creation_timestamp_ms = int((current_time - (days_ago * 24 * 60 * 60)) * 1000)
-
-                # Mock the settings response
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    f"log-test-{days_ago:03d}": {
-                        "settings": {
-                            "index": {
-                                "creation_date": str(creation_timestamp_ms)
-                            }
-                        }
-                    }
-                }
-                self.mock_requests.get.return_value = mock_response
-
-                # Mock other conditions to isolate age testing
-                self.ilm._is_write_index = Mock(return_value=False)
-                self.ilm._is_searchable_snapshot = Mock(return_value=False)
-
-                result = self.ilm._is_ready_for_snapshot(f"log-test-{days_ago:03d}")
-                self.assertEqual(result, expected_ready, description)
-
-    @patch('time.time')
-    def test_age_calculation_deterministic(self, mock_time):
+    @pytest.mark.parametrize("days_ago,creation_timestamp_ms,expected_ready,description", READY_FOR_SNAPSHOT_CASES)
+    def test_ready_for_snapshot_with_correct_ages(self, days_ago, creation_timestamp_ms, expected_ready, description):
+        """Test snapshot readiness against the frozen clock"""
+        # Mock the settings response
+        self.mock_requests.get.return_value = _settings_response(f"log-test-{days_ago:03d}", creation_timestamp_ms)
+
+        # Mock other conditions to isolate age testing
+        self.ilm._is_write_index = Mock(return_value=False)
+        self.ilm._is_searchable_snapshot = Mock(return_value=False)
+
+        result = self.ilm._is_ready_for_snapshot(f"log-test-{days_ago:03d}")
+        assert result == expected_ready, description
+
+    @pytest.mark.parametrize("creation_ms,expected_age,description", [
+        (1756834419619, 12.9, "Sept 2, 2025 timestamp should be ~13 days old"),  # Your actual timestamp
+        (1757535300048, 4.8, "Sept 10, 2025 timestamp should be ~5 days old"),   # Your second timestamp
+        (1755086400000, 33.1, "Aug 13, 2025 timestamp should be ~33 days old"),  # 33 days earlier
+        (1752577200000, 62.2, "July 15, 2025 timestamp should be ~62 days old"), # 62 days earlier
+        # Test actual future timestamp
+        (FROZEN_NOW * 1000 + 864000000, 0, "Future timestamp should return 0"),  # 10 days future
+    ])
+    def test_age_calculation_deterministic(self, creation_ms, expected_age, description):
         """Test age calculation with fixed time for deterministic results"""
-        # Fix current time to a known value (Sept 15, 2025 for example)
-        fixed_current_time = 1757949600  # Sept 15, 2025 12:00:00 GMT
-        mock_time.return_value = fixed_current_time
-
-        # Test cases with known timestamps
-        test_cases = [
-            # (creation_timestamp_ms, expected_age_days, description)
-            (1756834419619, 12.9, "Sept 2, 2025 timestamp should be ~13 days old"),  # Your actual timestamp
-            (1757535300048, 4.8, "Sept 10, 2025 timestamp should be ~5 days old"),   # Your second timestamp
-            (1755086400000, 33.1, "Aug 13, 2025 timestamp should be ~33 days old"),  # 33 days earlier
-            (1752577200000, 62.2, "July 15, 2025 timestamp should be ~62 days old"), # 62 days earlier
-            # Test actual future timestamp
-            (int(fixed_current_time * 1000) + 864000000, 0, "Future timestamp should return 0"),  # 10 days future
-        ]
+        self.mock_requests.get.return_value = _settings_response("test-index", creation_ms)
+
+        age_days = self.ilm._get_index_age_days("test-index")
 
-        for creation_ms, expected_age, description in test_cases:
-            with self.subTest(creation_ms=creation_ms):
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "test-index": {
-                        "settings": {
-                            "index": {
-                                "creation_date": str(creation_ms)
-                            }
-                        }
-                    }
-                }
-                self.mock_requests.get.return_value = mock_response
-
-                age_days = self.ilm._get_index_age_days("test-index")
-
-                if expected_age == 0:
-                    self.assertEqual(age_days, 0, description)
-                else:
-                    self.assertAlmostEqual(age_days, expected_age, delta=0.2, msg=description)
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        if expected_age == 0:
+            assert age_days == 0, description
+        else:
+            assert age_days == pytest.approx(expected_age, abs=0.2), description
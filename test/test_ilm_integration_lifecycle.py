@@ -1,714 +1,515 @@
 #!/usr/bin/env python3
+"""Integration tests for the complete index lifecycle: creation -> rollover -> transition -> cleanup"""
 
-import unittest
-import time
-from unittest.mock import Mock, MagicMock, patch, call
-import sys
-import os
+import logging
+import re
+from types import MappingProxyType
+from unittest.mock import Mock
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
 from ilm import Ilm
-from settings import Settings
+from test.helpers import FROZEN_NOW, SECONDS_PER_DAY, _response, _stub
 
+log = logging.getLogger(__name__)
 
-class TestIlmIntegrationLifecycle(unittest.TestCase):
-    """Integration test for complete index lifecycle: creation -> rollover -> transition"""
+pytestmark = pytest.mark.usefixtures("frozen_time")
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        self.mock_settings.number_of_days_on_hot_storage = 7
-        self.mock_settings.number_of_days_total_retention = 90
-        self.mock_settings.rollover_size_gb = 50
-        self.mock_settings.rollover_age_days = 30
-        self.mock_settings.managed_index_patterns = ("log-", "alert-")
 
-        self.mock_requests = Mock()
-        self.mock_settings.get_requests_object.return_value = self.mock_requests
-
-        self.ilm = Ilm(self.mock_settings)
+def _settings_response(index_name, creation_ms, **index_settings):
+    """Build a GET /<index>/_settings response with the given creation date"""
+    return _response(200, {
+        index_name: {
+            "settings": {
+                "index": {
+                    "creation_date": str(creation_ms),
+                    **index_settings
+                }
+            }
+        }
+    })
 
-        # Track time for dynamic timestamps
-        self.current_time = time.time()
 
-    def test_complete_index_lifecycle(self):
-        """Test complete lifecycle: new alias -> rollover -> transition after hot storage period"""
+# Shared fallback for URLs a test does not expect
+_NOT_FOUND = _response(404)
 
-        # === PHASE 1: Initial state - new alias with 00001 index ===
-        print("\\n=== PHASE 1: Initial state - new alias with log-application-000001 ===")
+# GET /<index>/_settings and GET /<index>/_alias, the per-index lookups Ilm makes
+_INDEX_URL_RE = re.compile(r"/(?P<index>[^/]+)/(?P<kind>_settings|_alias)$")
 
-        initial_indices = [
-            {"index": "log-application-000001"}
-        ]
+# Position of each lookup kind in the per-index (settings, alias) response pair
+_KIND_SLOT = {"_settings": 0, "_alias": 1}
 
-        # 00001 is currently the write index
-        initial_alias_data = {
-            "log-application-000001": {
-                "aliases": {
-                    "log-application-write": {
-                        "is_write_index": True
-                    }
-                }
-            }
+# Rollover of log-application-write from 000001 to 000002; these payloads do not depend on the clock
+_ROLLOVER_RESPONSE = _response(200, {
+    "rolled_over": True,
+    "old_index": "log-application-000001",
+    "new_index": "log-application-000002"
+})
+_ALL_ALIASES_AFTER_ROLLOVER = _response(200, {
+    "log-application-000001": {
+        "aliases": {
+            "log-application-write": {"is_write_index": False}
         }
-
-        # Mock age calculation for 00001 (1 day old - too young for transition)
-        day_1_timestamp = int((self.current_time - (1 * 24 * 60 * 60)) * 1000)
-
-        def phase1_mock_get_response(url):
-            if "_settings" in url and "log-application-000001" in url:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "log-application-000001": {
-                        "settings": {
-                            "index": {
-                                "creation_date": str(day_1_timestamp)
-                            }
-                        }
-                    }
-                }
-                return mock_response
-            elif "_alias" in url:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = initial_alias_data
-                return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = phase1_mock_get_response
-        self.ilm.get_indices = Mock(return_value=initial_indices)
-        self.ilm._snapshot_and_replace_index = Mock()
-        self.ilm._is_searchable_snapshot = Mock(return_value=False)
-
-        # Run ILM - should not transition anything (00001 is write index and too young)
-        self.ilm.transition_old_indices_to_snapshots()
-
-        # Verify no transitions occurred
-        self.ilm._snapshot_and_replace_index.assert_not_called()
-        print("✓ Phase 1: No transitions (00001 is write index and only 1 day old)")
-
-        # === PHASE 2: Rollover occurs - 00002 becomes write index ===
-        print("\\n=== PHASE 2: Rollover occurs - log-application-000002 becomes write index ===")
-
-        # Simulate rollover by mocking the rollover operation
-        mock_rollover_response = Mock()
-        mock_rollover_response.status_code = 200
-        mock_rollover_response.json.return_value = {
-            "rolled_over": True,
-            "old_index": "log-application-000001",
-            "new_index": "log-application-000002"
+    },
+    "log-application-000002": {
+        "aliases": {
+            "log-application-write": {"is_write_index": True}
         }
-
-        # Mock the rollover API call
-        def rollover_mock_post(url, **kwargs):
-            if "_rollover" in url:
-                return mock_rollover_response
-            return Mock(status_code=404)
-
-        self.mock_requests.post.side_effect = rollover_mock_post
-
-        # Mock write aliases list
-        def rollover_mock_get(url):
-            if url.endswith("/_alias"):
-                # Return write aliases
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "log-application-000001": {
-                        "aliases": {
-                            "log-application-write": {"is_write_index": False}
-                        }
-                    },
-                    "log-application-000002": {
-                        "aliases": {
-                            "log-application-write": {"is_write_index": True}
-                        }
-                    }
-                }
-                return mock_response
-            elif "_alias/log-application-write" in url:
-                # Return specific alias info
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "log-application-000002": {
-                        "aliases": {
-                            "log-application-write": {"is_write_index": True}
-                        }
-                    }
-                }
-                return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = rollover_mock_get
-        self.ilm._get_write_aliases = Mock(return_value=["log-application-write"])
-        self.ilm._get_write_index = Mock(return_value="log-application-000002")
-
-        # Run rollover check
-        result = self.ilm.check_and_rollover_by_size()
-
-        print("✓ Phase 2: Rollover completed - 000002 is now write index, 000001 is no longer write index")
-
-        # === PHASE 3: Time passes - 00001 becomes eligible for transition ===
-        print("\\n=== PHASE 3: Time passes - 000001 becomes eligible for transition (8 days old) ===")
-
-        # Update indices list to include both
-        updated_indices = [
-            {"index": "log-application-000001"},
-            {"index": "log-application-000002"}
-        ]
-
-        # Update alias data - 00002 is now write index, 00001 is not
-        updated_alias_data = {
-            "log-application-000001": {
-                "aliases": {
-                    "log-application-write": {
-                        "is_write_index": False
-                    }
-                }
-            },
-            "log-application-000002": {
-                "aliases": {
-                    "log-application-write": {
-                        "is_write_index": True
-                    }
-                }
-            }
+    }
+})
+_WRITE_ALIAS_AFTER_ROLLOVER = _response(200, {
+    "log-application-000002": {
+        "aliases": {
+            "log-application-write": {"is_write_index": True}
         }
+    }
+})
 
-        # 00001 is now 8 days old (eligible for transition)
-        # 00002 is 1 day old (too young for transition)
-        day_8_timestamp = int((self.current_time - (8 * 24 * 60 * 60)) * 1000)
-        day_1_timestamp_new = int((self.current_time - (1 * 24 * 60 * 60)) * 1000)
-
-        def phase3_mock_get_response(url):
-            if "_settings" in url:
-                if "log-application-000001" in url:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {
-                        "log-application-000001": {
-                            "settings": {
-                                "index": {
-                                    "creation_date": str(day_8_timestamp)
-                                }
-                            }
-                        }
-                    }
-                    return mock_response
-                elif "log-application-000002" in url:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {
-                        "log-application-000002": {
-                            "settings": {
-                                "index": {
-                                    "creation_date": str(day_1_timestamp_new)
-                                }
-                            }
-                        }
-                    }
-                    return mock_response
-            elif "_alias" in url:
-                for index_name in ["log-application-000001", "log-application-000002"]:
-                    if index_name in url:
-                        is_write = (index_name == "log-application-000002")
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "aliases": {
-                                    "log-application-write": {
-                                        "is_write_index": is_write
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = phase3_mock_get_response
-        self.ilm.get_indices = Mock(return_value=updated_indices)
-        self.ilm._snapshot_and_replace_index.reset_mock()  # Reset previous calls
-
-        # Run ILM transition - should now transition 00001
-        self.ilm.transition_old_indices_to_snapshots()
-
-        # Verify 00001 was transitioned but 00002 was not
-        self.ilm._snapshot_and_replace_index.assert_called_once_with("log-application-000001")
-        print("✓ Phase 3: log-application-000001 was transitioned to searchable snapshot (8 days old, no longer write index)")
-
-        # === PHASE 4: Verify complete state ===
-        print("\\n=== PHASE 4: Verify final state ===")
-
-        # Test individual conditions for verification
-
-        # 00001 should be managed (matches pattern)
-        should_manage_001 = self.ilm._should_manage_index("log-application-000001")
-        self.assertTrue(should_manage_001, "log-application-000001 should be managed (matches log- pattern)")
-
-        # 00001 should be ready for snapshot (old enough and not write index)
-        is_ready_001 = self.ilm._is_ready_for_snapshot("log-application-000001")
-        self.assertTrue(is_ready_001, "log-application-000001 should be ready for snapshot (8 days old, not write index)")
-
-        # 00002 should be managed but not ready for snapshot (write index)
-        should_manage_002 = self.ilm._should_manage_index("log-application-000002")
-        self.assertFalse(should_manage_002, "log-application-000002 should not be managed (write index)")
-
-        # Verify ages are calculated correctly
-        age_001 = self.ilm._get_index_age_days("log-application-000001")
-        age_002 = self.ilm._get_index_age_days("log-application-000002")
-
-        self.assertAlmostEqual(age_001, 8.0, delta=0.1, msg="log-application-000001 should be 8 days old")
-        self.assertAlmostEqual(age_002, 1.0, delta=0.1, msg="log-application-000002 should be 1 day old")
-
-        print(f"✓ Phase 4: Final verification complete")
-        print(f"  - log-application-000001: {age_001:.1f} days old, transitioned to searchable snapshot")
-        print(f"  - log-application-000002: {age_002:.1f} days old, remains as write index")
-
-    def test_rollover_size_based_trigger(self):
-        """Test that rollover is triggered when size conditions are met"""
-        print("\\n=== Testing size-based rollover trigger ===")
-
-        # Mock write aliases and indices
-        self.ilm._get_write_aliases = Mock(return_value=["log-application-write"])
-        self.ilm._get_write_index = Mock(return_value="log-application-000001")
-
-        # Mock successful rollover response
-        mock_rollover_response = Mock()
-        mock_rollover_response.status_code = 200
-        mock_rollover_response.json.return_value = {
-            "rolled_over": True,
-            "old_index": "log-application-000001",
-            "new_index": "log-application-000002"
-        }
 
-        self.mock_requests.post.return_value = mock_rollover_response
+# GET /_alias and GET /_settings, the cluster-wide lookups Ilm makes once per sweep
+_ALL_ALIASES_URL = "https://test-opensearch:9200/_alias"
+_ALL_SETTINGS_URL = "https://test-opensearch:9200/_settings"
+
+
+def _dispatch(url, responses, cluster_responses=MappingProxyType({})):
+    """Resolve a GET from cluster-wide responses keyed by URL without its query string,
+    then from prebuilt (settings, alias) response pairs keyed by exact index name"""
+    cluster_response = cluster_responses.get(url.partition("?")[0])
+    if cluster_response is not None:
+        return cluster_response
+    match = _INDEX_URL_RE.search(url)
+    pair = responses.get(match["index"]) if match else None
+    if pair is None:
+        return _NOT_FOUND
+    return pair[_KIND_SLOT[match["kind"]]]
+
+
+# Frozen clock for every test in the module (Sept 15, 2025 12:00:00 GMT)
+_MS_PER_DAY = 86_400_000
+
+
+def _build_timestamps(ages):
+    """Creation timestamps in epoch milliseconds for indices created the given days before FROZEN_NOW"""
+    now_ms = FROZEN_NOW * 1000
+    return {index_name: now_ms - days * _MS_PER_DAY for index_name, days in ages.items()}
+
+
+def _snapshot_row(snapshot_id, days):
+    """_cat/snapshots row for a successful snapshot that ended the given days before FROZEN_NOW"""
+    epoch = str(FROZEN_NOW - days * SECONDS_PER_DAY)
+    return {"id": snapshot_id, "status": "SUCCESS", "start_epoch": epoch, "end_epoch": epoch, "endEpoch": epoch}
+
+
+def make_mock_get(timestamps, write_indices=frozenset()):
+    """Build a GET side effect answering _settings and _alias lookups for the given indices.
+
+    Indices ending in -snapshot are searchable snapshots: remote_snapshot store and no write alias.
+    Every other index carries a <prefix>-write alias that is the write index when listed in write_indices.
+    """
+    responses = {}
+    settings_map = {}
+    alias_map = {}
+    for index_name, timestamp in timestamps.items():
+        if index_name.endswith("-snapshot"):
+            store, aliases = {"type": "remote_snapshot"}, {}
+        else:
+            store = {}
+            aliases = {f"{index_name.rsplit('-', 1)[0]}-write": {"is_write_index": index_name in write_indices}}
+        settings_response = _settings_response(index_name, timestamp, store=store)
+        settings_map.update(settings_response.json())
+        alias_map[index_name] = {"aliases": aliases}
+        responses[index_name] = (settings_response, _response(200, {index_name: alias_map[index_name]}))
+    cluster_responses = {
+        _ALL_ALIASES_URL: _response(200, alias_map),
+        _ALL_SETTINGS_URL: _response(200, settings_map),
+    }
+    return lambda url: _dispatch(url, responses, cluster_responses)
+
+
+@pytest.fixture
+def mock_requests():
+    """Fresh requests stand-in per test"""
+    return Mock()
+
+
+@pytest.fixture
+def ilm(make_settings, mock_requests):
+    """Fresh Ilm per test; Ilm only reads settings at construction"""
+    return Ilm(make_settings(requests_object=mock_requests))
+
+
+# log-application-write before and after its first rollover: (index ages in days, write indices).
+# Before: 000001 is the write index and 1 day old. After: 000001 is 8 days old and no longer
+# the write index, 000002 is the new 1 day old write index.
+BEFORE_ROLLOVER = ({"log-application-000001": 1}, {"log-application-000001"})
+AFTER_ROLLOVER = ({"log-application-000001": 8, "log-application-000002": 1}, {"log-application-000002"})
 
-        # Run rollover check
-        self.ilm.check_and_rollover_by_size()
 
-        # Verify rollover API was called with correct conditions
-        expected_url = "https://test-opensearch:9200/log-application-write/_rollover"
-        expected_body = {
-            "conditions": {
-                "max_size": "50gb",
-                "max_age": "30d"
-            }
-        }
+def _load_state(ilm, mock_requests, ages, write_indices):
+    """Serve the given indices to Ilm and return the list that records transitioned indices"""
+    timestamps = _build_timestamps(ages)
 
-        self.mock_requests.post.assert_called_once_with(expected_url, json=expected_body)
-        print("✓ Rollover API called with correct size (50GB) and age (30d) conditions")
-
-    def test_multiple_indices_lifecycle(self):
-        """Test lifecycle with multiple index patterns"""
-        print("\\n=== Testing multiple indices lifecycle ===")
-
-        current_time = time.time()
-
-        # Mock multiple indices with different ages and write statuses
-        indices = [
-            {"index": "log-application-000001"},  # 10 days old, not write
-            {"index": "log-application-000002"},  # 2 days old, write index
-            {"index": "log-security-000001"},     # 15 days old, not write
-            {"index": "log-security-000002"},     # 3 days old, write index
-            {"index": "alert-intrusion-000001"},  # 12 days old, not write
-            {"index": "alert-intrusion-000002"},  # 1 day old, write index
-        ]
-
-        # Create timestamps
-        timestamps = {
-            "log-application-000001": int((current_time - (10 * 24 * 60 * 60)) * 1000),
-            "log-application-000002": int((current_time - (2 * 24 * 60 * 60)) * 1000),
-            "log-security-000001": int((current_time - (15 * 24 * 60 * 60)) * 1000),
-            "log-security-000002": int((current_time - (3 * 24 * 60 * 60)) * 1000),
-            "alert-intrusion-000001": int((current_time - (12 * 24 * 60 * 60)) * 1000),
-            "alert-intrusion-000002": int((current_time - (1 * 24 * 60 * 60)) * 1000),
-        }
+    mock_requests.get.side_effect = make_mock_get(timestamps, write_indices)
+    transitioned = []
+    _stub(
+        ilm,
+        get_indices=Mock(return_value=[{"index": index_name} for index_name in timestamps]),
+        _is_searchable_snapshot=Mock(return_value=False),
+        _snapshot_and_replace_index=transitioned.append,
+    )
+    return transitioned
+
+
+def test_phase2_rollover(ilm, mock_requests):
+    """Rollover makes log-application-000002 the write index in place of 000001"""
+    log.debug("=== PHASE 2: Rollover occurs - log-application-000002 becomes write index ===")
+
+    # Mock the rollover API call
+    def rollover_mock_post(url, **kwargs):
+        if "_rollover" in url:
+            return _ROLLOVER_RESPONSE
+        return _NOT_FOUND
+
+    mock_requests.post.side_effect = rollover_mock_post
+
+    def rollover_mock_get(url):
+        if url.endswith("/_alias"):
+            # Return write aliases
+            return _ALL_ALIASES_AFTER_ROLLOVER
+        elif "_alias/log-application-write" in url:
+            # Return specific alias info
+            return _WRITE_ALIAS_AFTER_ROLLOVER
+        return _NOT_FOUND
+
+    mock_requests.get.side_effect = rollover_mock_get
+    _stub(
+        ilm,
+        _get_write_aliases=Mock(return_value=["log-application-write"]),
+        _get_write_index=Mock(return_value="log-application-000001"),
+    )
+
+    # Run rollover check
+    ilm.check_and_rollover_by_size()
+
+    assert mock_requests.post.call_args[0][0] == "https://test-opensearch:9200/log-application-write/_rollover"
+    log.debug("✓ Phase 2: Rollover completed - 000002 is now write index, 000001 is no longer write index")
+
+
+def test_phase4_final_state(ilm, mock_requests):
+    """After rollover and the hot storage period, 000001 is ready for snapshot and 000002 is not"""
+    log.debug("=== PHASE 4: Verify final state ===")
+    _load_state(ilm, mock_requests, *AFTER_ROLLOVER)
+
+    # 00001 should be managed (matches pattern)
+    assert ilm._should_manage_index("log-application-000001"), \
+        "log-application-000001 should be managed (matches log- pattern)"
+
+    # 00001 should be ready for snapshot (old enough and not write index)
+    assert ilm._is_ready_for_snapshot("log-application-000001"), \
+        "log-application-000001 should be ready for snapshot (8 days old, not write index)"
+
+    # 00002 should be managed but not ready for snapshot (write index)
+    assert not ilm._should_manage_index("log-application-000002"), \
+        "log-application-000002 should not be managed (write index)"
+
+    # Verify ages are calculated correctly
+    age_001 = ilm._get_index_age_days("log-application-000001")
+    age_002 = ilm._get_index_age_days("log-application-000002")
+
+    assert age_001 == 8.0, "log-application-000001 should be 8 days old"
+    assert age_002 == 1.0, "log-application-000002 should be 1 day old"
 
-        # Define write indices
-        write_indices = {
-            "log-application-000002",
-            "log-security-000002",
-            "alert-intrusion-000002"
-        }
+    log.debug("✓ Phase 4: Final verification complete")
+    log.debug("  - log-application-000001: %.1f days old, transitioned to searchable snapshot", age_001)
+    log.debug("  - log-application-000002: %.1f days old, remains as write index", age_002)
 
-        def multi_mock_get_response(url):
-            if "_settings" in url:
-                for index_name, timestamp in timestamps.items():
-                    if index_name in url:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "settings": {
-                                    "index": {
-                                        "creation_date": str(timestamp)
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            elif "_alias" in url:
-                for index_name in timestamps.keys():
-                    if index_name in url:
-                        is_write = index_name in write_indices
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "aliases": {
-                                    f"{index_name.rsplit('-', 1)[0]}-write": {
-                                        "is_write_index": is_write
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = multi_mock_get_response
-        self.ilm.get_indices = Mock(return_value=indices)
-        self.ilm._snapshot_and_replace_index = Mock()
-        self.ilm._is_searchable_snapshot = Mock(return_value=False)
-
-        # Run ILM transition
-        self.ilm.transition_old_indices_to_snapshots()
-
-        # Expected transitions: only non-write indices older than 7 days
-        expected_transitions = [
-            "log-application-000001",  # 10 days old, not write
-            "log-security-000001",     # 15 days old, not write
-            "alert-intrusion-000001",  # 12 days old, not write
-        ]
-
-        # Verify correct indices were transitioned
-        actual_calls = [call[0][0] for call in self.ilm._snapshot_and_replace_index.call_args_list]
-
-        self.assertEqual(len(actual_calls), 3, "Should transition exactly 3 indices")
-        for expected_index in expected_transitions:
-            self.assertIn(expected_index, actual_calls, f"{expected_index} should be transitioned")
-
-        print(f"✓ Multiple indices lifecycle: {len(expected_transitions)} indices transitioned correctly")
-        for index in expected_transitions:
-            print(f"  - {index}: transitioned (old enough and not write index)")
-
-    def test_cleanup_old_data_lifecycle(self):
-        """Test complete cleanup lifecycle: regular indices, searchable snapshots, and snapshots beyond retention"""
-        print("\\n=== Testing cleanup lifecycle for data older than retention period (90 days) ===")
-
-        current_time = time.time()
-
-        # === Setup: Mix of indices and snapshots with different ages ===
-
-        # Indices (mix of regular, searchable snapshots, and various ages)
-        indices = [
-            {"index": "log-application-000001"},      # 100 days old, regular index - should be deleted
-            {"index": "log-application-000001-snapshot"}, # 95 days old, searchable snapshot - should be deleted
-            {"index": "log-application-000002"},      # 80 days old, regular index - should stay
-            {"index": "log-application-000002-snapshot"}, # 70 days old, searchable snapshot - should stay
-            {"index": "log-security-000001"},         # 120 days old, regular index - should be deleted
-            {"index": "log-security-000002"},         # 30 days old, regular index - should stay
-        ]
-
-        # Snapshots (with corresponding ages)
-        snapshots = [
-            {
-                "id": "log-application-000001",
-                "status": "SUCCESS",
-                "start_epoch": str(int(current_time - (100 * 24 * 60 * 60))),
-                "end_epoch": str(int(current_time - (100 * 24 * 60 * 60))),
-                "endEpoch": str(int(current_time - (100 * 24 * 60 * 60)))
-            },
-            {
-                "id": "log-application-000002",
-                "status": "SUCCESS",
-                "start_epoch": str(int(current_time - (80 * 24 * 60 * 60))),
-                "end_epoch": str(int(current_time - (80 * 24 * 60 * 60))),
-                "endEpoch": str(int(current_time - (80 * 24 * 60 * 60)))
-            },
-            {
-                "id": "log-security-000001",
-                "status": "SUCCESS",
-                "start_epoch": str(int(current_time - (120 * 24 * 60 * 60))),
-                "end_epoch": str(int(current_time - (120 * 24 * 60 * 60))),
-                "endEpoch": str(int(current_time - (120 * 24 * 60 * 60)))
-            },
-            {
-                "id": "log-security-000002",
-                "status": "SUCCESS",
-                "start_epoch": str(int(current_time - (30 * 24 * 60 * 60))),
-                "end_epoch": str(int(current_time - (30 * 24 * 60 * 60))),
-                "endEpoch": str(int(current_time - (30 * 24 * 60 * 60)))
-            }
-        ]
-
-        # Create timestamps for age calculation
-        timestamps = {
-            "log-application-000001": int((current_time - (100 * 24 * 60 * 60)) * 1000),
-            "log-application-000001-snapshot": int((current_time - (95 * 24 * 60 * 60)) * 1000),
-            "log-application-000002": int((current_time - (80 * 24 * 60 * 60)) * 1000),
-            "log-application-000002-snapshot": int((current_time - (70 * 24 * 60 * 60)) * 1000),
-            "log-security-000001": int((current_time - (120 * 24 * 60 * 60)) * 1000),
-            "log-security-000002": int((current_time - (30 * 24 * 60 * 60)) * 1000),
-        }
 
-        def cleanup_mock_get_response(url):
-            if "_settings" in url:
-                for index_name, timestamp in timestamps.items():
-                    if index_name in url:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "settings": {
-                                    "index": {
-                                        "creation_date": str(timestamp),
-                                        "store": {"type": "remote_snapshot"} if index_name.endswith("-snapshot") else {}
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            elif "_alias" in url:
-                # All indices are non-write for this test
-                for index_name in timestamps.keys():
-                    if index_name in url:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "aliases": {}
-                            }
-                        }
-                        return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = cleanup_mock_get_response
-        self.ilm.get_indices = Mock(return_value=indices)
-        self.ilm.get_snapshots = Mock(return_value=snapshots)
-
-        # Mock delete operations
-        self.ilm._delete_index = Mock()
-        self.ilm._delete_snapshot = Mock()
-        self.ilm._delete_snapshot_with_cleanup = Mock()
-
-        # === Execute cleanup ===
-        self.ilm.cleanup_old_data()
-
-        # === Verify Phase 1: Searchable snapshot indices cleanup ===
-        print("\\n--- Phase 1: Searchable snapshot indices cleanup ---")
-
-        # Should delete searchable snapshots older than 90 days
-        expected_searchable_deletions = [
-            "log-application-000001-snapshot"  # 95 days old
-        ]
-
-        searchable_deletions = []
-        for call in self.ilm._delete_index.call_args_list:
-            index_name = call[0][0]
-            if index_name.endswith("-snapshot"):
-                searchable_deletions.append(index_name)
-
-        for expected in expected_searchable_deletions:
-            self.assertIn(expected, [call[0][0] for call in self.ilm._delete_index.call_args_list],
-                         f"Searchable snapshot {expected} should be deleted (older than 90 days)")
-
-        print(f"✓ Phase 1: {len(expected_searchable_deletions)} searchable snapshot indices deleted")
-
-        # === Verify Phase 2: Regular indices cleanup ===
-        print("\\n--- Phase 2: Regular indices cleanup ---")
-
-        # Should delete regular indices older than 90 days
-        expected_regular_deletions = [
-            "log-application-000001",  # 100 days old
-            "log-security-000001",     # 120 days old
-        ]
-
-        regular_deletions = []
-        for call in self.ilm._delete_index.call_args_list:
-            index_name = call[0][0]
-            if not index_name.endswith("-snapshot"):
-                regular_deletions.append(index_name)
-
-        for expected in expected_regular_deletions:
-            self.assertIn(expected, [call[0][0] for call in self.ilm._delete_index.call_args_list],
-                         f"Regular index {expected} should be deleted (older than 90 days)")
-
-        print(f"✓ Phase 2: {len(expected_regular_deletions)} regular indices deleted")
-
-        # === Verify Phase 3: Snapshots cleanup ===
-        print("\\n--- Phase 3: Snapshots cleanup ---")
-
-        # Should delete snapshots older than 90 days
-        expected_snapshot_deletions = [
-            "log-application-000001",  # 100 days old
-            "log-security-000001",     # 120 days old
-        ]
-
-        snapshot_deletions = [call[0][0] for call in self.ilm._delete_snapshot_with_cleanup.call_args_list]
-
-        for expected in expected_snapshot_deletions:
-            self.assertIn(expected, snapshot_deletions,
-                         f"Snapshot {expected} should be deleted (older than 90 days)")
-
-        print(f"✓ Phase 3: {len(expected_snapshot_deletions)} snapshots deleted")
-
-        # === Verify what should NOT be deleted ===
-        print("\\n--- Verification: What should remain ---")
-
-        should_remain_indices = [
-            "log-application-000002",         # 80 days old
-            "log-application-000002-snapshot", # 70 days old
-            "log-security-000002",            # 30 days old
-        ]
-
-        should_remain_snapshots = [
-            "log-application-000002",  # 80 days old
-            "log-security-000002",     # 30 days old
-        ]
-
-        all_deleted_indices = [call[0][0] for call in self.ilm._delete_index.call_args_list]
-        all_deleted_snapshots = [call[0][0] for call in self.ilm._delete_snapshot_with_cleanup.call_args_list]
-
-        for index in should_remain_indices:
-            self.assertNotIn(index, all_deleted_indices,
-                           f"Index {index} should NOT be deleted (younger than 90 days)")
-
-        for snapshot in should_remain_snapshots:
-            self.assertNotIn(snapshot, all_deleted_snapshots,
-                           f"Snapshot {snapshot} should NOT be deleted (younger than 90 days)")
-
-        print(f"✓ Verification: {len(should_remain_indices)} indices and {len(should_remain_snapshots)} snapshots correctly preserved")
-
-        # === Summary ===
-        print("\\n=== Cleanup Summary ===")
-        print(f"Deleted indices: {len(all_deleted_indices)} (regular: {len(regular_deletions)}, searchable: {len(searchable_deletions)})")
-        print(f"Deleted snapshots: {len(all_deleted_snapshots)}")
-        print(f"Preserved indices: {len(should_remain_indices)}")
-        print(f"Preserved snapshots: {len(should_remain_snapshots)}")
-
-    def test_end_to_end_complete_lifecycle(self):
-        """Test complete end-to-end lifecycle: creation -> rollover -> transition -> cleanup"""
-        print("\\n=== COMPLETE END-TO-END LIFECYCLE TEST ===")
-
-        current_time = time.time()
-
-        # === Timeline simulation ===
-        # Day 0: log-app-000001 created (write index)
-        # Day 30: Rollover occurs -> log-app-000002 created (becomes write index)
-        # Day 37: log-app-000001 transitioned to searchable snapshot (7 days after rollover)
-        # Day 90: log-app-000001 still preserved (exactly at retention limit)
-        # Day 100: log-app-000001 and its snapshot should be cleaned up (beyond retention)
-
-        # Simulate the state at Day 100
-        indices = [
-            {"index": "log-app-000001-snapshot"},  # Day 37: searchable snapshot, now 100 days from original creation
-            {"index": "log-app-000002"},           # Day 30: non-write index, 70 days old
-            {"index": "log-app-000003"},           # Day 60: current write index, 40 days old
-        ]
-
-        snapshots = [
-            {
-                "id": "log-app-000001",
-                "status": "SUCCESS",
-                "end_epoch": str(int(current_time - (100 * 24 * 60 * 60))),  # 100 days old
-            },
-            {
-                "id": "log-app-000002",
-                "status": "SUCCESS",
-                "end_epoch": str(int(current_time - (70 * 24 * 60 * 60))),   # 70 days old
-            }
-        ]
+def test_rollover_size_based_trigger(ilm, mock_requests):
+    """Test that rollover is triggered when size conditions are met"""
+    log.debug("=== Testing size-based rollover trigger ===")
 
-        timestamps = {
-            "log-app-000001-snapshot": int((current_time - (100 * 24 * 60 * 60)) * 1000),  # Original creation date
-            "log-app-000002": int((current_time - (70 * 24 * 60 * 60)) * 1000),
-            "log-app-000003": int((current_time - (40 * 24 * 60 * 60)) * 1000),
-        }
+    # Mock write aliases and indices
+    _stub(
+        ilm,
+        _get_write_aliases=Mock(return_value=["log-application-write"]),
+        _get_write_index=Mock(return_value="log-application-000001"),
+    )
+
+    # Record (url, body) of each POST and answer with a successful rollover
+    posts = []
+
+    def record_post(url, **kwargs):
+        posts.append((url, kwargs.get("json")))
+        return _ROLLOVER_RESPONSE
+
+    mock_requests.post = record_post
 
-        def e2e_mock_get_response(url):
-            if "_settings" in url:
-                for index_name, timestamp in timestamps.items():
-                    if index_name in url:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "settings": {
-                                    "index": {
-                                        "creation_date": str(timestamp),
-                                        "store": {"type": "remote_snapshot"} if index_name.endswith("-snapshot") else {}
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            elif "_alias" in url:
-                # log-app-000003 is the current write index
-                for index_name in timestamps.keys():
-                    if index_name in url:
-                        is_write = (index_name == "log-app-000003")
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "aliases": {
-                                    "log-app-write": {
-                                        "is_write_index": is_write
-                                    }
-                                } if not index_name.endswith("-snapshot") else {}
-                            }
-                        }
-                        return mock_response
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = e2e_mock_get_response
-        self.ilm.get_indices = Mock(return_value=indices)
-        self.ilm.get_snapshots = Mock(return_value=snapshots)
-
-        # Mock operations
-        self.ilm._snapshot_and_replace_index = Mock()
-        self.ilm._delete_index = Mock()
-        self.ilm._delete_snapshot_with_cleanup = Mock()
-        self.ilm._is_searchable_snapshot = Mock(side_effect=lambda x: x.endswith("-snapshot"))
-
-        print("\\n--- Running transition phase ---")
-        self.ilm.transition_old_indices_to_snapshots()
-
-        print("\\n--- Running cleanup phase ---")
-        self.ilm.cleanup_old_data()
-
-        # === Verification ===
-        print("\\n--- End-to-End Verification ---")
-
-        # Should transition log-app-000002 (70 days old, no longer write index)
-        transition_calls = self.ilm._snapshot_and_replace_index.call_args_list
-        self.assertEqual(len(transition_calls), 1, "Should transition log-app-000002 (70 days old, no longer write index)")
-        self.assertEqual(transition_calls[0][0][0], "log-app-000002", "Should transition log-app-000002")
-
-        # Cleanup should remove old data (100 days > 90 days retention)
-        deleted_indices = [call[0][0] for call in self.ilm._delete_index.call_args_list]
-        deleted_snapshots = [call[0][0] for call in self.ilm._delete_snapshot_with_cleanup.call_args_list]
-
-        self.assertIn("log-app-000001-snapshot", deleted_indices, "100-day-old searchable snapshot should be deleted")
-        self.assertIn("log-app-000001", deleted_snapshots, "100-day-old snapshot should be deleted")
-
-        # Newer data should be preserved
-        self.assertNotIn("log-app-000002", deleted_indices, "70-day-old index should be preserved")
-        self.assertNotIn("log-app-000003", deleted_indices, "40-day-old write index should be preserved")
-        self.assertNotIn("log-app-000002", deleted_snapshots, "70-day-old snapshot should be preserved")
-
-        print("✓ End-to-end lifecycle completed successfully:")
-        print(f"  - Transitions: {len(transition_calls)} (log-app-000002 transitioned)")
-        print(f"  - Indices deleted: {len(deleted_indices)} (expected: 1)")
-        print(f"  - Snapshots deleted: {len(deleted_snapshots)} (expected: 1)")
-        print(f"  - Data beyond 90-day retention properly cleaned up")
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    # Run rollover check
+    ilm.check_and_rollover_by_size()
+
+    # Verify rollover API was called with correct conditions
+    expected_url = "https://test-opensearch:9200/log-application-write/_rollover"
+    expected_body = {
+        "conditions": {
+            "max_size": "50gb",
+            "max_age": "30d"
+        }
+    }
+
+    assert posts == [(expected_url, expected_body)]
+    log.debug("✓ Rollover API called with correct size (50GB) and age (30d) conditions")
+
+
+# (index ages in days, write indices, expected transitions)
+TRANSITION_CASES = [
+    # Phase 1: the new write index is too young and still the write index
+    pytest.param(*BEFORE_ROLLOVER, [], id="phase1_no_transition_young_write_index"),
+    # Phase 3: after rollover and the hot storage period only 000001 moves to a searchable snapshot
+    pytest.param(*AFTER_ROLLOVER, ["log-application-000001"], id="phase3_old_index_transitioned"),
+    pytest.param(
+        {
+            "log-application-000001": 10,  # not write
+            "log-application-000002": 2,   # write index
+            "log-security-000001": 15,     # not write
+            "log-security-000002": 3,      # write index
+            "alert-intrusion-000001": 12,  # not write
+            "alert-intrusion-000002": 1,   # write index
+        },
+        {"log-application-000002", "log-security-000002", "alert-intrusion-000002"},
+        ["log-application-000001", "log-security-000001", "alert-intrusion-000001"],
+        id="multiple_patterns",
+    ),
+]
+
+
+@pytest.mark.parametrize("ages, write_indices, expected_transitions", TRANSITION_CASES)
+def test_transition(ilm, mock_requests, ages, write_indices, expected_transitions):
+    """Only non-write indices older than the hot storage period are transitioned"""
+    transitioned = _load_state(ilm, mock_requests, ages, write_indices)
+
+    ilm.transition_old_indices_to_snapshots()
+
+    assert sorted(transitioned) == sorted(expected_transitions)
+    # Write status and creation dates come from the cluster-wide lookups, not one request per index
+    requested = {c.args[0].partition("?")[0] for c in mock_requests.get.call_args_list}
+    assert requested <= {_ALL_ALIASES_URL, _ALL_SETTINGS_URL}
+    log.debug("✓ %s indices transitioned correctly", len(expected_transitions))
+    for index in expected_transitions:
+        log.debug("  - %s: transitioned (old enough and not write index)", index)
+
+
+# Index ages in days for the cleanup scenario, against 90 days total retention
+CLEANUP_INDEX_AGES = {
+    "log-application-000001": 100,
+    "log-application-000001-snapshot": 95,
+    "log-application-000002": 80,
+    "log-application-000002-snapshot": 70,
+    "log-security-000001": 120,
+    "log-security-000002": 30,
+}
+CLEANUP_TIMESTAMPS = _build_timestamps(CLEANUP_INDEX_AGES)
+CLEANUP_SNAPSHOTS = tuple(
+    _snapshot_row(index_name, days)
+    for index_name, days in CLEANUP_INDEX_AGES.items()
+    if not index_name.endswith("-snapshot")
+)
+
+
+def test_cleanup_old_data_lifecycle(ilm, mock_requests):
+    """Test complete cleanup lifecycle: regular indices, searchable snapshots, and snapshots beyond retention"""
+    log.debug("=== Testing cleanup lifecycle for data older than retention period (90 days) ===")
+
+    # === Setup: Mix of indices and snapshots with different ages ===
+
+    # Indices (mix of regular, searchable snapshots, and various ages)
+    indices = [
+        {"index": "log-application-000001"},      # 100 days old, regular index - should be deleted
+        {"index": "log-application-000001-snapshot"}, # 95 days old, searchable snapshot - should be deleted
+        {"index": "log-application-000002"},      # 80 days old, regular index - should stay
+        {"index": "log-application-000002-snapshot"}, # 70 days old, searchable snapshot - should stay
+        {"index": "log-security-000001"},         # 120 days old, regular index - should be deleted
+        {"index": "log-security-000002"},         # 30 days old, regular index - should stay
+    ]
+
+    # Snapshots share the age of the index they were taken from; none of these indices is a write index
+    snapshots = list(CLEANUP_SNAPSHOTS)
+    timestamps = CLEANUP_TIMESTAMPS
+
+    mock_requests.get.side_effect = make_mock_get(timestamps)
+
+    # Record deletions into plain lists; phase 1 appends from worker threads, which list.append tolerates
+    deleted_indices = []
+    deleted_snapshot_batches = []
+    _stub(
+        ilm,
+        get_indices=Mock(return_value=indices),
+        get_snapshots=Mock(return_value=snapshots),
+        _delete_index=deleted_indices.append,
+        _delete_snapshot=Mock(),
+        _bulk_delete_snapshots=deleted_snapshot_batches.append,
+    )
+
+    # === Execute cleanup ===
+    ilm.cleanup_old_data()
+
+    all_deleted_indices = set(deleted_indices)
+    all_deleted_snapshots = {name for batch in deleted_snapshot_batches for name in batch}
+    searchable_deletions = {name for name in all_deleted_indices if name.endswith("-snapshot")}
+    regular_deletions = all_deleted_indices - searchable_deletions
+    assert len(deleted_snapshot_batches) == 1, "Snapshots should be deleted in a single bulk call"
+
+    # === Verify Phase 1: Searchable snapshot indices cleanup ===
+    log.debug("--- Phase 1: Searchable snapshot indices cleanup ---")
+
+    # Should delete searchable snapshots older than 90 days
+    expected_searchable_deletions = [
+        "log-application-000001-snapshot"  # 95 days old
+    ]
+
+    for expected in expected_searchable_deletions:
+        assert expected in searchable_deletions, \
+            f"Searchable snapshot {expected} should be deleted (older than 90 days)"
+
+    log.debug("✓ Phase 1: %s searchable snapshot indices deleted", len(expected_searchable_deletions))
+
+    # === Verify Phase 2: Regular indices cleanup ===
+    log.debug("--- Phase 2: Regular indices cleanup ---")
+
+    # Should delete regular indices older than 90 days
+    expected_regular_deletions = [
+        "log-application-000001",  # 100 days old
+        "log-security-000001",     # 120 days old
+    ]
+
+    for expected in expected_regular_deletions:
+        assert expected in regular_deletions, \
+            f"Regular index {expected} should be deleted (older than 90 days)"
+
+    log.debug("✓ Phase 2: %s regular indices deleted", len(expected_regular_deletions))
+
+    # === Verify Phase 3: Snapshots cleanup ===
+    log.debug("--- Phase 3: Snapshots cleanup ---")
+
+    # Should delete snapshots older than 90 days
+    expected_snapshot_deletions = [
+        "log-application-000001",  # 100 days old
+        "log-security-000001",     # 120 days old
+    ]
+
+    for expected in expected_snapshot_deletions:
+        assert expected in all_deleted_snapshots, \
+            f"Snapshot {expected} should be deleted (older than 90 days)"
+
+    log.debug("✓ Phase 3: %s snapshots deleted", len(expected_snapshot_deletions))
+
+    # === Verify what should NOT be deleted ===
+    log.debug("--- Verification: What should remain ---")
+
+    should_remain_indices = [
+        "log-application-000002",         # 80 days old
+        "log-application-000002-snapshot", # 70 days old
+        "log-security-000002",            # 30 days old
+    ]
+
+    should_remain_snapshots = [
+        "log-application-000002",  # 80 days old
+        "log-security-000002",     # 30 days old
+    ]
+
+    for index in should_remain_indices:
+        assert index not in all_deleted_indices, \
+            f"Index {index} should NOT be deleted (younger than 90 days)"
+
+    for snapshot in should_remain_snapshots:
+        assert snapshot not in all_deleted_snapshots, \
+            f"Snapshot {snapshot} should NOT be deleted (younger than 90 days)"
+
+    log.debug("✓ Verification: %s indices and %s snapshots correctly preserved", len(should_remain_indices), len(should_remain_snapshots))
+
+    # === Summary ===
+    log.debug("=== Cleanup Summary ===")
+    log.debug("Deleted indices: %s (regular: %s, searchable: %s)", len(all_deleted_indices), len(regular_deletions), len(searchable_deletions))
+    log.debug("Deleted snapshots: %s", len(all_deleted_snapshots))
+    log.debug("Preserved indices: %s", len(should_remain_indices))
+    log.debug("Preserved snapshots: %s", len(should_remain_snapshots))
+
+
+# Index ages in days at day 100 of the end-to-end timeline
+END_TO_END_INDEX_AGES = {
+    "log-app-000001-snapshot": 100,  # Original creation date
+    "log-app-000002": 70,
+    "log-app-000003": 40,
+}
+END_TO_END_TIMESTAMPS = _build_timestamps(END_TO_END_INDEX_AGES)
+
+
+def test_end_to_end_complete_lifecycle(ilm, mock_requests):
+    """Test complete end-to-end lifecycle: creation -> rollover -> transition -> cleanup"""
+    log.debug("=== COMPLETE END-TO-END LIFECYCLE TEST ===")
+
+    # === Timeline simulation ===
+    # Day 0: log-app-000001 created (write index)
+    # Day 30: Rollover occurs -> log-app-000002 created (becomes write index)
+    # Day 37: log-app-000001 transitioned to searchable snapshot (7 days after rollover)
+    # Day 90: log-app-000001 still preserved (exactly at retention limit)
+    # Day 100: log-app-000001 and its snapshot should be cleaned up (beyond retention)
+
+    # Simulate the state at Day 100
+    indices = [
+        {"index": "log-app-000001-snapshot"},  # Day 37: searchable snapshot, now 100 days from original creation
+        {"index": "log-app-000002"},           # Day 30: non-write index, 70 days old
+        {"index": "log-app-000003"},           # Day 60: current write index, 40 days old
+    ]
+
+    snapshots = [
+        _snapshot_row("log-app-000001", 100),
+        _snapshot_row("log-app-000002", 70),
+    ]
+
+    timestamps = END_TO_END_TIMESTAMPS
+
+    # log-app-000003 is the current write index
+    mock_requests.get.side_effect = make_mock_get(timestamps, write_indices={"log-app-000003"})
+
+    # Record operations into plain lists
+    transitioned = []
+    deleted_indices = []
+    deleted_snapshot_batches = []
+    _stub(
+        ilm,
+        get_indices=Mock(return_value=indices),
+        get_snapshots=Mock(return_value=snapshots),
+        _snapshot_and_replace_index=transitioned.append,
+        _delete_index=deleted_indices.append,
+        _bulk_delete_snapshots=deleted_snapshot_batches.append,
+        _is_searchable_snapshot=Mock(side_effect=lambda x: x.endswith("-snapshot")),
+    )
+
+    log.debug("--- Running transition phase ---")
+    ilm.transition_old_indices_to_snapshots()
+
+    log.debug("--- Running cleanup phase ---")
+    ilm.cleanup_old_data()
+
+    # === Verification ===
+    log.debug("--- End-to-End Verification ---")
+
+    # Should transition log-app-000002 (70 days old, no longer write index)
+    assert transitioned == ["log-app-000002"], "Should transition log-app-000002 (70 days old, no longer write index)"
+
+    # Cleanup should remove old data (100 days > 90 days retention)
+    deleted_snapshots = deleted_snapshot_batches[0]
+
+    assert "log-app-000001-snapshot" in deleted_indices, "100-day-old searchable snapshot should be deleted"
+    assert "log-app-000001" in deleted_snapshots, "100-day-old snapshot should be deleted"
+
+    # Newer data should be preserved
+    assert "log-app-000002" not in deleted_indices, "70-day-old index should be preserved"
+    assert "log-app-000003" not in deleted_indices, "40-day-old write index should be preserved"
+    assert "log-app-000002" not in deleted_snapshots, "70-day-old snapshot should be preserved"
+
+    log.debug("✓ End-to-end lifecycle completed successfully:")
+    log.debug("  - Transitions: %s (log-app-000002 transitioned)", len(transitioned))
+    log.debug("  - Indices deleted: %s (expected: 1)", len(deleted_indices))
+    log.debug("  - Snapshots deleted: %s (expected: 1)", len(deleted_snapshots))
+    log.debug("  - Data beyond 90-day retention properly cleaned up")
@@ -3,29 +3,31 @@
 import unittest
 import time
 from unittest.mock import Mock, MagicMock, patch
-import sys
-import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ilm import Ilm
 from settings import Settings
+from test.helpers import _response
+
+BASE_URL = "https://test-opensearch:9200"
 
 
 class TestIlmWriteIndexDetection(unittest.TestCase):
     """Unit tests for ILM write index detection and management logic"""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        self.mock_settings.number_of_days_on_hot_storage = 7
-        self.mock_settings.number_of_days_total_retention = 90
-        self.mock_settings.rollover_size_gb = 50
-        self.mock_settings.rollover_age_days = 30
-        self.mock_settings.managed_index_patterns = ("log-", "alert-")
+    @classmethod
+    def setUpClass(cls):
+        """Build the Settings mock once; Ilm only reads it during construction."""
+        cls.mock_settings = Mock(spec=Settings)
+        cls.mock_settings.url = "https://test-opensearch:9200"
+        cls.mock_settings.number_of_days_on_hot_storage = 7
+        cls.mock_settings.number_of_days_total_retention = 90
+        cls.mock_settings.rollover_size_gb = 50
+        cls.mock_settings.rollover_age_days = 30
+        cls.mock_settings.managed_index_patterns = ("log-", "alert-")
+        cls.mock_settings.max_transitions_per_cycle = 50
 
+    def setUp(self):
+        """Give each test a fresh requests mock and Ilm, since Ilm keeps per-sweep caches."""
         self.mock_requests = Mock()
         self.mock_settings.get_requests_object.return_value = self.mock_requests
 
@@ -67,6 +69,9 @@ class TestIlmWriteIndexDetection(unittest.TestCase):
                 result = self.ilm._should_manage_index(index_name)
                 self.assertEqual(result, expected, f"Index {index_name} should not be managed")
 
+        # The prefix check fails first, so no alias lookup is made for unrelated indices
+        self.ilm._is_write_index.assert_not_called()
+
     def test_should_not_manage_write_indices(self):
         """Test that write indices are not managed even if they match patterns"""
         test_cases = [
@@ -111,40 +116,43 @@ class TestIlmWriteIndexDetection(unittest.TestCase):
             ("log-infoblox-dns-000006", True),   # Is a write index
         ]
 
+        # One GET /_alias returns the aliases of every index
+        self.mock_requests.get.return_value = _response(200, alias_data)
+
         for index_name, expected_is_write in test_cases:
             with self.subTest(index_name=index_name):
-                # Mock the API response
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {index_name: alias_data[index_name]}
-                self.mock_requests.get.return_value = mock_response
-
                 result = self.ilm._is_write_index(index_name)
                 self.assertEqual(result, expected_is_write,
                     f"Index {index_name} write status should be {expected_is_write}")
 
-                # Verify API call
-                self.mock_requests.get.assert_called_with(f"https://test-opensearch:9200/{index_name}/_alias")
+        # Verify both lookups were answered by a single cluster-wide API call
+        self.mock_requests.get.assert_called_once_with("https://test-opensearch:9200/_alias")
+
+    def test_is_write_index_falls_back_for_unknown_index(self):
+        """Test that an index missing from the alias map is checked with its own API call"""
+        self.mock_requests.get.side_effect = [
+            _response(200, {"log-infoblox-dns-000001": {"aliases": {}}}),
+            _response(200, {"log-infoblox-dns-000007": {"aliases": {"log-infoblox-dns-write": {"is_write_index": True}}}}),
+        ]
+
+        result = self.ilm._is_write_index("log-infoblox-dns-000007")
+        self.assertTrue(result, "Index created after the alias map was fetched should be checked directly")
+        self.mock_requests.get.assert_called_with("https://test-opensearch:9200/log-infoblox-dns-000007/_alias")
 
     def test_is_write_index_no_aliases(self):
         """Test write index detection for index with no aliases"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        self.mock_requests.get.return_value = _response(200, {
             "log-standalone-000001": {
                 "aliases": {}
             }
-        }
-        self.mock_requests.get.return_value = mock_response
+        })
 
         result = self.ilm._is_write_index("log-standalone-000001")
         self.assertFalse(result, "Index with no aliases should not be considered a write index")
 
     def test_is_write_index_api_error(self):
         """Test write index detection when API call fails"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        self.mock_requests.get.return_value = mock_response
+        self.mock_requests.get.return_value = _response(404)
 
         result = self.ilm._is_write_index("log-nonexistent-000001")
         self.assertFalse(result, "Failed API call should return False for write index check")
@@ -203,61 +211,23 @@ class TestIlmWriteIndexDetection(unittest.TestCase):
             ("log-infoblox-dns-000006", 10, True, False, "Write index should never be snapshot-ready regardless of age"),
         ]
 
+        # Build the settings and alias payloads for every case once, before the subtests run
+        settings_data = {
+            index_name: {"settings": {"index": {"creation_date": str(int((current_time - days_old * 24 * 60 * 60) * 1000))}}}
+            for index_name, days_old, _, _, _ in test_cases
+        }
+        alias_data = {
+            index_name: {"aliases": {"log-infoblox-dns-write": {"is_write_index": is_write}}}
+            for index_name, _, is_write, _, _ in test_cases
+        }
+        url_map = {
+            f"{BASE_URL}/_settings": _response(200, settings_data),
+            f"{BASE_URL}/_alias": _response(200, alias_data),
+        }
+        self.mock_requests.get.side_effect = lambda url: url_map[url.partition("?")[0]]
+
         for index_name, days_old, is_write, expected_ready, description in test_cases:
             with self.subTest(index_name=index_name):
-                # Create dynamic timestamp for specified days ago
-                creation_timestamp_ms = int((current_time - (days_old * 24 * 60 * 60)) * 1000)
-
-                # Mock the settings response for age calculation
-                mock_settings_response = Mock()
-                mock_settings_response.status_code = 200
-                mock_settings_response.json.return_value = {
-                    index_name: {
-                        "settings": {
-                            "index": {
-                                "creation_date": str(creation_timestamp_ms)
-                            }
-                        }
-                    }
-                }
-
-                # Mock alias response for write index detection
-                if is_write:
-                    alias_data = {
-                        index_name: {
-                            "aliases": {
-                                "log-infoblox-dns-write": {
-                                    "is_write_index": True
-                                }
-                            }
-                        }
-                    }
-                else:
-                    alias_data = {
-                        index_name: {
-                            "aliases": {
-                                "log-infoblox-dns-write": {
-                                    "is_write_index": False
-                                }
-                            }
-                        }
-                    }
-
-                mock_alias_response = Mock()
-                mock_alias_response.status_code = 200
-                mock_alias_response.json.return_value = alias_data
-
-                # Configure mock to return appropriate response based on URL
-                def mock_get_response(url):
-                    if "_settings" in url:
-                        return mock_settings_response
-                    elif "_alias" in url:
-                        return mock_alias_response
-                    else:
-                        return Mock(status_code=404)
-
-                self.mock_requests.get.side_effect = mock_get_response
-
                 # Test the full pipeline: should_manage -> is_ready_for_snapshot
                 should_manage = self.ilm._should_manage_index(index_name)
 
@@ -298,44 +268,27 @@ class TestIlmWriteIndexDetection(unittest.TestCase):
             "log-infoblox-dns-000006": int((current_time - (10 * 24 * 60 * 60)) * 1000),
         }
 
-        # Mock responses for each index
-        def mock_get_response(url):
-            if "_settings" in url:
-                for index_name in timestamps:
-                    if index_name in url:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "settings": {
-                                    "index": {
-                                        "creation_date": str(timestamps[index_name])
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-            elif "_alias" in url:
-                # Only 000006 is write index
-                for index_name in ["log-infoblox-dns-000001", "log-infoblox-dns-000005", "log-infoblox-dns-000006"]:
-                    if index_name in url:
-                        is_write = (index_name == "log-infoblox-dns-000006")
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {
-                            index_name: {
-                                "aliases": {
-                                    "log-infoblox-dns-write": {
-                                        "is_write_index": is_write
-                                    }
-                                }
-                            }
-                        }
-                        return mock_response
-
-            return Mock(status_code=404)
-
-        self.mock_requests.get.side_effect = mock_get_response
+        # Only 000006 is write index
+        alias_map = {
+            index_name: {
+                "aliases": {
+                    "log-infoblox-dns-write": {
+                        "is_write_index": index_name == "log-infoblox-dns-000006"
+                    }
+                }
+            }
+            for index_name in timestamps
+        }
+
+        # Cluster-wide alias and settings lookups; any per-index fallback would raise KeyError
+        url_map = {
+            f"{BASE_URL}/_alias": _response(200, alias_map),
+            f"{BASE_URL}/_settings": _response(200, {
+                index_name: {"settings": {"index": {"creation_date": str(timestamp)}}}
+                for index_name, timestamp in timestamps.items()
+            }),
+        }
+        self.mock_requests.get.side_effect = lambda url: url_map[url.partition("?")[0]]
         self.ilm._snapshot_and_replace_index = Mock()
         self.ilm._is_searchable_snapshot = Mock(return_value=False)
 
@@ -345,6 +298,10 @@ class TestIlmWriteIndexDetection(unittest.TestCase):
         # Verify that only log-infoblox-dns-000001 was processed for snapshot
         self.ilm._snapshot_and_replace_index.assert_called_once_with("log-infoblox-dns-000001")
 
+        # Write status and ages for all three indices came from one alias and one settings lookup
+        requested = [c.args[0].partition("?")[0] for c in self.mock_requests.get.call_args_list]
+        self.assertEqual(requested, [f"{BASE_URL}/_alias", f"{BASE_URL}/_settings"])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
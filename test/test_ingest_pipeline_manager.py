@@ -4,11 +4,8 @@ import unittest
 import json
 import yaml
 from unittest.mock import Mock, patch, mock_open
-import sys
 import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tempfile
 
 from ingest_pipeline_manager import IngestPipelineManager
 from settings import Settings
@@ -17,11 +14,14 @@ from settings import Settings
 class TestIngestPipelineManager(unittest.TestCase):
     """Unit tests for IngestPipelineManager class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the Settings mock once; the manager only reads it during construction."""
+        cls.mock_settings = Mock(spec=Settings)
+        cls.mock_settings.url = "https://test-opensearch:9200"
+
     def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        
+        """Give each test a fresh requests mock and manager."""
         self.mock_requests = Mock()
         self.mock_settings.get_requests_object.return_value = self.mock_requests
         
@@ -71,9 +71,26 @@ class TestIngestPipelineManager(unittest.TestCase):
         self.assertEqual(result, 200)
         self.mock_requests.put.assert_called_with(
             "https://test-opensearch:9200/_ingest/pipeline/test-pipeline",
-            data=test_json_data
+            data=test_json_data.encode("utf-8")
         )
 
+    def test_upload_json_sends_utf8_bytes(self):
+        """Test that non-ASCII pipeline bodies are sent as UTF-8 bytes over the shared session"""
+        # Settings hands out a fresh session per call, so reuse shows as every PUT landing on the first one
+        sessions = [Mock(**{"put.return_value": Mock(status_code=200)}) for _ in range(2)]
+        settings = Mock(spec=Settings, url=self.mock_settings.url)
+        settings.get_requests_object.side_effect = sessions
+        pipeline_manager = IngestPipelineManager(settings)
+        test_json_data = json.dumps({"description": "Café pipeline"}, ensure_ascii=False)
+
+        pipeline_manager._upload_json(test_json_data, "first")
+        pipeline_manager._upload_json(test_json_data, "second")
+
+        self.assertEqual(sessions[0].put.call_count, 2)
+        sessions[1].put.assert_not_called()
+        body = sessions[0].put.call_args.kwargs["data"]
+        self.assertEqual(json.loads(body.decode("utf-8")), {"description": "Café pipeline"})
+
     def test_upload_json_failure(self):
         """Test failed pipeline upload"""
         mock_response = Mock()
@@ -86,9 +103,15 @@ class TestIngestPipelineManager(unittest.TestCase):
             "processors": []
         })
         
-        result = self.pipeline_manager._upload_json(test_json_data, "invalid-pipeline")
+        with patch('builtins.print') as mock_print:
+            result = self.pipeline_manager._upload_json(test_json_data, "invalid-pipeline")
         
         self.assertEqual(result, 400)
+        # The error is a single line naming the pipeline, so concurrent uploads can't split it up
+        error_line = mock_print.call_args.args[0]
+        self.assertIn("invalid-pipeline", error_line)
+        self.assertIn("400", error_line)
+        self.assertIn("Bad request - invalid pipeline", error_line)
 
     @patch('glob.glob')
     @patch.object(IngestPipelineManager, '_read_yaml')
@@ -133,6 +156,28 @@ class TestIngestPipelineManager(unittest.TestCase):
         mock_upload.assert_any_call(expected_json, "apache")
         mock_upload.assert_any_call(expected_json, "filebeat")
 
+    def test_read_pipeline_json_reuses_unchanged_file(self):
+        """Test that an unchanged pipeline file is only parsed once across syncs"""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "nginx.yml")
+            with open(file_path, "w") as file:
+                yaml.dump({"description": "Nginx", "processors": []}, file)
+
+            with patch.object(IngestPipelineManager, '_read_yaml', wraps=self.pipeline_manager._read_yaml) as mock_read:
+                first = self.pipeline_manager._read_pipeline_json(file_path)
+                second = IngestPipelineManager(self.mock_settings)._read_pipeline_json(file_path)
+                self.assertEqual(mock_read.call_count, 1)
+
+                # A rewrite changes the size, so the file is parsed again
+                with open(file_path, "w") as file:
+                    yaml.dump({"description": "Nginx updated", "processors": []}, file)
+                third = self.pipeline_manager._read_pipeline_json(file_path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(json.loads(first), {"description": "Nginx", "processors": []})
+        self.assertEqual(json.loads(third), {"description": "Nginx updated", "processors": []})
+        self.assertEqual(mock_read.call_count, 2)
+
     @patch('glob.glob')
     def test_sync_to_cluster_no_files(self, mock_glob):
         """Test synchronization when no YAML files are found"""
@@ -179,14 +224,16 @@ class TestIngestPipelineManager(unittest.TestCase):
         # Mock YAML data
         mock_read.return_value = {"description": "Test", "processors": []}
         
-        # Mock mixed upload results
-        mock_upload.side_effect = [200, 400]  # First succeeds, second fails
+        # Mock mixed upload results keyed by pipeline, since uploads run concurrently
+        upload_results = {"success": 200, "failure": 400}
+        mock_upload.side_effect = lambda json_data, pipeline_name: upload_results[pipeline_name]
         
         # This should not raise an exception despite one failure
         self.pipeline_manager.sync_to_cluster("/path/to/pipelines")
         
         # Verify both uploads were attempted
         self.assertEqual(mock_upload.call_count, 2)
+        mock_upload.assert_any_call(json.dumps({"description": "Test", "processors": []}), "failure")
 
     def test_yaml_to_json_conversion(self):
         """Test YAML to JSON conversion in the sync process"""
@@ -230,7 +277,7 @@ class TestIngestPipelineManager(unittest.TestCase):
         # (headers should come from the session configuration in Settings)
         self.mock_requests.put.assert_called_with(
             "https://test-opensearch:9200/_ingest/pipeline/test-pipeline",
-            data=test_json_data
+            data=test_json_data.encode("utf-8")
         )
 
 
@@ -1,330 +1,192 @@
 #!/usr/bin/env python3
 
-import unittest
 import json
-from unittest.mock import Mock, patch
-import sys
-import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from unittest.mock import Mock
 
 from snapshot import Snapshot
-from settings import Settings
-
-
-class TestSnapshot(unittest.TestCase):
-    """Unit tests for Snapshot class"""
-
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        self.mock_settings.bucket = "test-bucket"
-        self.mock_settings.repository = "data"
-        
-        self.mock_requests = Mock()
-        self.mock_settings.get_requests_object.return_value = self.mock_requests
-
-    @patch('snapshot.Snapshot.register_bucket')
-    def test_init(self, mock_register_bucket):
-        """Test Snapshot initialization"""
-        mock_register_bucket.return_value = True
-        snapshot = Snapshot(self.mock_settings)
-        
-        self.assertEqual(snapshot.base_url, "https://test-opensearch:9200")
-        self.assertEqual(snapshot.bucket_name, "test-bucket")
-        self.assertEqual(snapshot.repository, "data")
-        self.assertEqual(snapshot.requests, self.mock_requests)
-        
-        # Check indices list
-        expected_indices = [".kibana*", 
-                           ".opensearch-sap-pre-packaged-rules-config", 
-                           ".plugins-ml-config", 
-                           ".opensearch-observability", 
-                           ".opensearch-notifications-config", 
-                           ".opensearch-sap-log-types-config"]
-        self.assertEqual(snapshot.indices, expected_indices)
-        
-        # Verify register_bucket was called
-        mock_register_bucket.assert_called_once()
-
-    def test_register_bucket_already_exists(self):
-        """Test register_bucket when repository already exists"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.requests = self.mock_requests
-            result = snapshot.register_bucket()
-        
-        self.assertTrue(result)
-        self.mock_requests.get.assert_called_with("https://test-opensearch:9200/_snapshot/data")
-
-    def test_register_bucket_new_repository_success(self):
-        """Test register_bucket when creating new repository successfully"""
-        # Mock 404 response for initial check
-        mock_get_response = Mock()
-        mock_get_response.status_code = 404
-        
-        # Mock 200 response for repository creation
-        mock_put_response = Mock()
-        mock_put_response.status_code = 200
-        
-        self.mock_requests.get.return_value = mock_get_response
-        self.mock_requests.put.return_value = mock_put_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            result = snapshot.register_bucket()
-        
-        self.assertTrue(result)
-        
-        # Verify repository creation call
-        expected_payload = {
-            "type": "s3",
-            "settings": {
-                "bucket": "test-bucket",
-                "compress": True
-            }
-        }
-        self.mock_requests.put.assert_called_with(
-            "https://test-opensearch:9200/_snapshot/data", 
-            data=json.dumps(expected_payload)
-        )
-
-    def test_register_bucket_new_repository_failure(self):
-        """Test register_bucket when repository creation fails"""
-        # Mock 404 response for initial check
-        mock_get_response = Mock()
-        mock_get_response.status_code = 404
-        
-        # Mock 500 response for repository creation failure
-        mock_put_response = Mock()
-        mock_put_response.status_code = 500
-        mock_put_response.text = "Internal server error"
-        
-        self.mock_requests.get.return_value = mock_get_response
-        self.mock_requests.put.return_value = mock_put_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            result = snapshot.register_bucket()
-        
-        self.assertFalse(result)
-
-    def test_restore_snapshot_success(self):
-        """Test successful snapshot restoration"""
-        # Mock successful delete responses for indices
-        mock_delete_response = Mock()
-        mock_delete_response.status_code = 200
-        
-        # Mock successful restore response
-        mock_restore_response = Mock()
-        mock_restore_response.status_code = 200
-        
-        self.mock_requests.delete.return_value = mock_delete_response
-        self.mock_requests.post.return_value = mock_restore_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.restore_snapshot("test-snapshot-123")
-        
-        self.assertTrue(result)
-        
-        # Verify delete calls for each index
-        self.assertEqual(self.mock_requests.delete.call_count, len(snapshot.indices))
-        
-        # Verify restore call
-        expected_restore_payload = {
-            "indices": snapshot.indices,
-            "include_global_state": False
-        }
-        self.mock_requests.post.assert_called_with(
-            "https://test-opensearch:9200/_snapshot/data/test-snapshot-123/_restore",
-            data=json.dumps(expected_restore_payload)
-        )
-
-    def test_restore_snapshot_failure(self):
-        """Test failed snapshot restoration"""
-        # Mock successful delete responses for indices
-        mock_delete_response = Mock()
-        mock_delete_response.status_code = 200
-        
-        # Mock failed restore response
-        mock_restore_response = Mock()
-        mock_restore_response.status_code = 500
-        mock_restore_response.text = "Restore failed"
-        
-        self.mock_requests.delete.return_value = mock_delete_response
-        self.mock_requests.post.return_value = mock_restore_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.restore_snapshot("test-snapshot-123")
-        
-        self.assertFalse(result)
-
-    def test_get_snapshots_success(self):
-        """Test successful snapshots listing"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "snapshot1 SUCCESS\nsnapshot2 SUCCESS"
-        
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.get_snapshots()
-        
-        self.assertTrue(result)
-        self.mock_requests.get.assert_called_with(
-            "https://test-opensearch:9200/_cat/snapshots/data?v&s=endEpoch"
-        )
-
-    def test_get_snapshots_failure(self):
-        """Test failed snapshots listing"""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal server error"
-        
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.get_snapshots()
-        
-        self.assertFalse(result)
-
-    def test_get_latest_snapshot_success(self):
-        """Test successful latest snapshot retrieval"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps([
-            {"id": "snapshot1", "status": "SUCCESS"},
-            {"id": "snapshot2", "status": "SUCCESS"},
-            {"id": "snapshot3", "status": "SUCCESS"}
-        ])
-        
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.get_latest_snapshot()
-        
-        self.assertEqual(result, "snapshot3")
-        self.mock_requests.get.assert_called_with(
-            "https://test-opensearch:9200/_cat/snapshots/data?v&s=endEpoch&format=json"
-        )
-
-    def test_get_latest_snapshot_failure(self):
-        """Test failed latest snapshot retrieval"""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            result = snapshot.get_latest_snapshot()
-        
-        self.assertEqual(result, "")
-
-    def test_get_latest_snapshot_empty_list(self):
-        """Test latest snapshot retrieval with empty snapshot list"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps([])
-        
-        self.mock_requests.get.return_value = mock_response
-        
-        with patch('snapshot.Snapshot.__init__', return_value=None):
-            snapshot = Snapshot.__new__(Snapshot)
-            snapshot.base_url = self.mock_settings.url
-            snapshot.repository = self.mock_settings.repository
-            snapshot.bucket_name = self.mock_settings.bucket
-            snapshot.requests = self.mock_requests
-            snapshot.indices = [".kibana*", 
-                               ".opensearch-sap-pre-packaged-rules-config", 
-                               ".plugins-ml-config", 
-                               ".opensearch-observability", 
-                               ".opensearch-notifications-config", 
-                               ".opensearch-sap-log-types-config"]
-            with self.assertRaises(IndexError):
-                snapshot.get_latest_snapshot()
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+from test.helpers import _response
+
+# System indices Snapshot restores; shared by every test, copied into a list where one is assigned
+EXPECTED_INDICES = (".kibana*",
+                    ".opensearch-sap-pre-packaged-rules-config",
+                    ".plugins-ml-config",
+                    ".opensearch-observability",
+                    ".opensearch-notifications-config",
+                    ".opensearch-sap-log-types-config")
+
+# Request bodies Snapshot sends for the test settings; input-independent, so serialized once
+EXPECTED_REGISTER_BODY = json.dumps({"type": "s3", "settings": {"bucket": "test-bucket", "compress": True}})
+EXPECTED_RESTORE_BODY = json.dumps({"indices": list(EXPECTED_INDICES), "include_global_state": False})
+
+# _cat/snapshots listings served to get_latest_snapshot
+SNAPSHOT_LIST_JSON = json.dumps([
+    {"id": "snapshot1", "status": "SUCCESS"},
+    {"id": "snapshot2", "status": "SUCCESS"},
+    {"id": "snapshot3", "status": "SUCCESS"}
+])
+EMPTY_SNAPSHOT_LIST_JSON = json.dumps([])
+
+# Endpoints Snapshot calls for the "data" repository
+URL_SNAPSHOT_REPOSITORY = "https://test-opensearch:9200/_snapshot/data"
+URL_RESTORE = f"{URL_SNAPSHOT_REPOSITORY}/test-snapshot-123/_restore"
+URL_CAT_SNAPSHOTS = "https://test-opensearch:9200/_cat/snapshots/data?v&s=endEpoch"
+URL_CAT_SNAPSHOTS_JSON = f"{URL_CAT_SNAPSHOTS}&format=json"
+
+
+# Responses without a specific body, shared by every test that needs one
+RESPONSE_200 = _response(200)
+RESPONSE_404 = _response(404)
+RESPONSE_500 = _response(500, text="Internal server error")
+
+
+@pytest.fixture
+def mock_requests():
+    """Fresh requests mock per test"""
+    return Mock()
+
+
+@pytest.fixture
+def mock_settings(make_settings, mock_requests):
+    """Settings stand-in handing out this test's requests mock; a missing attribute raises AttributeError"""
+    return make_settings(requests_object=mock_requests)
+
+
+@pytest.fixture
+def snapshot(mock_settings, mock_requests):
+    """Snapshot wired to the test's requests mock without running __init__ (which registers the bucket)"""
+    instance = Snapshot.__new__(Snapshot)
+    instance.base_url = mock_settings.url
+    instance.repository = mock_settings.repository
+    instance.bucket_name = mock_settings.bucket
+    instance.requests = mock_requests
+    instance.indices = list(EXPECTED_INDICES)
+    return instance
+
+
+def test_init(monkeypatch, mock_settings, mock_requests):
+    """Test Snapshot initialization"""
+    mock_register_bucket = Mock(return_value=True)
+    monkeypatch.setattr(Snapshot, "register_bucket", mock_register_bucket)
+
+    snapshot = Snapshot(mock_settings)
+
+    assert snapshot.base_url == "https://test-opensearch:9200"
+    assert snapshot.bucket_name == "test-bucket"
+    assert snapshot.repository == "data"
+    assert snapshot.requests == mock_requests
+
+    # Check indices list
+    assert snapshot.indices == list(EXPECTED_INDICES)
+
+    # Verify register_bucket was called
+    mock_register_bucket.assert_called_once()
+
+
+def test_register_bucket_already_exists(snapshot, mock_requests):
+    """Test register_bucket when repository already exists"""
+    mock_requests.get.return_value = RESPONSE_200
+
+    result = snapshot.register_bucket()
+
+    assert result
+    mock_requests.get.assert_called_with(URL_SNAPSHOT_REPOSITORY)
+
+
+def test_register_bucket_new_repository_success(snapshot, mock_requests):
+    """Test register_bucket when creating new repository successfully"""
+    # 404 for the initial check, 200 for repository creation
+    mock_requests.get.return_value = RESPONSE_404
+    mock_requests.put.return_value = RESPONSE_200
+
+    result = snapshot.register_bucket()
+
+    assert result
+
+    # Verify repository creation call
+    mock_requests.put.assert_called_with(URL_SNAPSHOT_REPOSITORY, data=EXPECTED_REGISTER_BODY)
+
+
+def test_register_bucket_new_repository_failure(snapshot, mock_requests):
+    """Test register_bucket when repository creation fails"""
+    # 404 for the initial check, 500 for repository creation
+    mock_requests.get.return_value = RESPONSE_404
+    mock_requests.put.return_value = RESPONSE_500
+
+    result = snapshot.register_bucket()
+
+    assert not result
+
+
+def test_restore_snapshot_success(snapshot, mock_requests):
+    """Test successful snapshot restoration"""
+    # Successful deletes for the indices and a successful restore
+    mock_requests.delete.return_value = RESPONSE_200
+    mock_requests.post.return_value = RESPONSE_200
+
+    result = snapshot.restore_snapshot("test-snapshot-123")
+
+    assert result
+
+    # Verify delete calls for each index
+    assert mock_requests.delete.call_count == len(snapshot.indices)
+
+    # Verify restore call
+    mock_requests.post.assert_called_with(URL_RESTORE, data=EXPECTED_RESTORE_BODY)
+
+
+def test_restore_snapshot_failure(snapshot, mock_requests):
+    """Test failed snapshot restoration"""
+    # Successful deletes for the indices but a failed restore
+    mock_requests.delete.return_value = RESPONSE_200
+    mock_requests.post.return_value = _response(500, text="Restore failed")
+
+    result = snapshot.restore_snapshot("test-snapshot-123")
+
+    assert not result
+
+
+def test_get_snapshots_success(snapshot, mock_requests):
+    """Test successful snapshots listing"""
+    mock_requests.get.return_value = _response(200, text="snapshot1 SUCCESS\nsnapshot2 SUCCESS")
+
+    result = snapshot.get_snapshots()
+
+    assert result
+    mock_requests.get.assert_called_with(URL_CAT_SNAPSHOTS)
+
+
+def test_get_snapshots_failure(snapshot, mock_requests):
+    """Test failed snapshots listing"""
+    mock_requests.get.return_value = RESPONSE_500
+
+    result = snapshot.get_snapshots()
+
+    assert not result
+
+
+def test_get_latest_snapshot_success(snapshot, mock_requests):
+    """Test successful latest snapshot retrieval"""
+    mock_requests.get.return_value = _response(200, text=SNAPSHOT_LIST_JSON)
+
+    result = snapshot.get_latest_snapshot()
+
+    assert result == "snapshot3"
+    mock_requests.get.assert_called_with(URL_CAT_SNAPSHOTS_JSON)
+
+
+def test_get_latest_snapshot_failure(snapshot, mock_requests):
+    """Test failed latest snapshot retrieval"""
+    mock_requests.get.return_value = RESPONSE_500
+
+    result = snapshot.get_latest_snapshot()
+
+    assert result == ""
+
+
+def test_get_latest_snapshot_empty_list(snapshot, mock_requests):
+    """Test latest snapshot retrieval with empty snapshot list"""
+    mock_requests.get.return_value = _response(200, text=EMPTY_SNAPSHOT_LIST_JSON)
+
+    with pytest.raises(IndexError):
+        snapshot.get_latest_snapshot()
@@ -2,183 +2,183 @@
 
 import unittest
 import json
-import os
-import tempfile
-from unittest.mock import Mock, patch, mock_open
-import sys
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from contextlib import ExitStack
+from io import StringIO
+from unittest.mock import Mock, call, patch
 
 from template_manager import TemplateManager, TemplateType
-from settings import Settings
+
+
+# Template bodies shared by the upload and sync tests; never mutated
+TEST_TEMPLATE = {"template": {"settings": {"number_of_shards": 1}}}
+TEST_COMPONENT = {"template": {"mappings": {"properties": {"field1": {"type": "text"}}}}}
+
+# File contents served to _read_json
+VALID_JSON_DATA = {"test": "data", "nested": {"key": "value"}}
+VALID_JSON_CONTENT = json.dumps(VALID_JSON_DATA)
+INVALID_JSON_CONTENT = "{ invalid json"
+
+# Endpoints _upload_json targets for the test template names
+URL_INDEX_TEMPLATE = "https://test-opensearch:9200/_index_template/test-template"
+URL_COMPONENT_TEMPLATE = "https://test-opensearch:9200/_component_template/ecs_8.0.0_test-component"
+
+
+class _SettingsStub:
+    """Minimal Settings stand-in; TemplateManager only reads url and the requests session"""
+    url = "https://test-opensearch:9200"
+
+    def __init__(self, requests):
+        self.requests = requests
+
+    def get_requests_object(self):
+        return self.requests
 
 
 class TestTemplateManager(unittest.TestCase):
     """Unit tests for TemplateManager class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the requests mock and manager once; TemplateManager keeps no per-call state."""
+        # TemplateManager only ever PUTs; any other attribute on the session is a test failure
+        cls.mock_requests = Mock(spec_set=["put"])
+        cls.template_manager = TemplateManager(_SettingsStub(cls.mock_requests))
+
     def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_settings = Mock(spec=Settings)
-        self.mock_settings.url = "https://test-opensearch:9200"
-        
-        self.mock_requests = Mock()
-        self.mock_settings.get_requests_object.return_value = self.mock_requests
-        
-        self.template_manager = TemplateManager(self.mock_settings)
+        """Clear recorded calls and configured responses so each test starts from a clean requests mock."""
+        self.mock_requests.reset_mock(return_value=True, side_effect=True)
+
+    def _put_responses(self, *status_codes):
+        """Queue one PUT response per expected upload, in call order"""
+        self.mock_requests.put.side_effect = [Mock(status_code=code, text="") for code in status_codes]
 
     def test_init(self):
         """Test TemplateManager initialization"""
         self.assertEqual(self.template_manager.base_url, "https://test-opensearch:9200")
-        self.assertEqual(self.template_manager.requests, self.mock_requests)
+        self.assertIs(self.template_manager.requests, self.mock_requests)
 
     def test_read_json_valid_file(self):
         """Test reading a valid JSON file"""
-        test_json_data = {"test": "data", "nested": {"key": "value"}}
-        json_content = json.dumps(test_json_data)
-        
-        with patch("builtins.open", mock_open(read_data=json_content)):
+        with patch("builtins.open", return_value=StringIO(VALID_JSON_CONTENT)):
             result = self.template_manager._read_json("test_file.json")
         
-        self.assertEqual(result, test_json_data)
+        self.assertEqual(result, VALID_JSON_DATA)
 
     def test_read_json_invalid_file(self):
         """Test reading an invalid JSON file"""
-        invalid_json = "{ invalid json"
-        
-        with patch("builtins.open", mock_open(read_data=invalid_json)):
+        with patch("builtins.open", return_value=StringIO(INVALID_JSON_CONTENT)):
             with self.assertRaises(json.JSONDecodeError):
                 self.template_manager._read_json("invalid_file.json")
 
-    def test_upload_json_index_template_success(self):
-        """Test successful index template upload"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        self.mock_requests.put.return_value = mock_response
-        
-        test_data = {"template": {"settings": {"number_of_shards": 1}}}
-        
-        result = self.template_manager._upload_json(
-            test_data, "test-template", TemplateType.INDEX_TEMPLATE
-        )
-        
-        self.assertEqual(result, 200)
-        self.mock_requests.put.assert_called_with(
-            "https://test-opensearch:9200/_index_template/test-template",
-            json=test_data
-        )
+    def test_upload_json_success(self):
+        """Test successful index and component template uploads"""
+        self.mock_requests.put.return_value = Mock(status_code=200)
 
-    def test_upload_json_component_template_success(self):
-        """Test successful component template upload"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        self.mock_requests.put.return_value = mock_response
-        
-        test_data = {"template": {"settings": {"number_of_shards": 1}}}
-        version = "8.0.0"
-        
-        result = self.template_manager._upload_json(
-            test_data, "test-component", TemplateType.COMPONENT_TEMPLATE, version
-        )
-        
-        self.assertEqual(result, 200)
-        expected_name = f"ecs_{version}_test-component"
-        self.mock_requests.put.assert_called_with(
-            f"https://test-opensearch:9200/_component_template/{expected_name}",
-            json=test_data
-        )
+        cases = [
+            ("test-template", TemplateType.INDEX_TEMPLATE, None, URL_INDEX_TEMPLATE),
+            ("test-component", TemplateType.COMPONENT_TEMPLATE, "8.0.0", URL_COMPONENT_TEMPLATE),
+        ]
+        for template_name, template_type, version, expected_url in cases:
+            with self.subTest(template_type=template_type):
+                result = self.template_manager._upload_json(
+                    TEST_TEMPLATE, template_name, template_type, version
+                )
+
+                self.assertEqual(result, 200)
+                self.mock_requests.put.assert_called_with(expected_url, json=TEST_TEMPLATE)
 
     def test_upload_json_component_template_no_version(self):
         """Test component template upload without version raises error"""
-        test_data = {"template": {"settings": {"number_of_shards": 1}}}
-        
         with self.assertRaises(ValueError) as context:
             self.template_manager._upload_json(
-                test_data, "test-component", TemplateType.COMPONENT_TEMPLATE
+                TEST_TEMPLATE, "test-component", TemplateType.COMPONENT_TEMPLATE
             )
         
         self.assertEqual(str(context.exception), "Version is required for component templates")
 
     def test_upload_json_index_template_failure(self):
         """Test failed index template upload"""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad request"
-        self.mock_requests.put.return_value = mock_response
-        
-        test_data = {"template": {"settings": {"number_of_shards": 1}}}
+        self.mock_requests.put.return_value = Mock(status_code=400, text="Bad request")
         
         result = self.template_manager._upload_json(
-            test_data, "test-template", TemplateType.INDEX_TEMPLATE
+            TEST_TEMPLATE, "test-template", TemplateType.INDEX_TEMPLATE
         )
         
         self.assertEqual(result, 400)
 
-    @patch('glob.glob')
-    @patch.object(TemplateManager, '_read_json')
-    @patch.object(TemplateManager, '_upload_json')
-    def test_sync_to_cluster_index_templates(self, mock_upload, mock_read, mock_glob):
-        """Test syncing index templates to cluster"""
-        # Mock glob to return list of JSON files
-        mock_glob.return_value = [
-            "/path/to/templates/template1.json",
-            "/path/to/templates/template2.json"
+    def test_sync_to_cluster_continues_after_failed_upload(self):
+        """Test that a rejected template does not stop the remaining uploads"""
+        self._put_responses(400, 200)
+
+        with patch('glob.glob', return_value=("/path/to/templates/bad.json", "/path/to/templates/test-template.json")), \
+                patch.object(TemplateManager, '_read_json', return_value=TEST_TEMPLATE):
+            self.template_manager.sync_to_cluster("/path/to/templates", TemplateType.INDEX_TEMPLATE)
+
+        self.assertEqual(self.mock_requests.put.call_args_list, [
+            call("https://test-opensearch:9200/_index_template/bad", json=TEST_TEMPLATE),
+            call(URL_INDEX_TEMPLATE, json=TEST_TEMPLATE),
+        ])
+
+
+class TestTemplateManagerSync(unittest.TestCase):
+    """Unit tests for TemplateManager.sync_to_cluster with file discovery, reading and uploading patched out"""
+
+    # glob.glob results; sync_to_cluster only iterates them
+    GLOB_INDEX_TEMPLATES = ("/path/to/templates/template1.json", "/path/to/templates/template2.json")
+    GLOB_COMPONENT_TEMPLATES = ("/path/to/components/component1.json",)
+    GLOB_COMPLEX_PATH = ("/complex/path/to/my-template.json",)
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the glob, _read_json and _upload_json patches once for the whole class."""
+        cls.template_manager = TemplateManager(_SettingsStub(Mock(spec_set=["put"])))
+
+        stack = ExitStack()
+        cls.addClassCleanup(stack.close)
+        cls.mock_glob = stack.enter_context(patch('glob.glob'))
+        cls.mock_read = stack.enter_context(patch.object(TemplateManager, '_read_json'))
+        cls.mock_upload = stack.enter_context(patch.object(TemplateManager, '_upload_json'))
+
+    def setUp(self):
+        self._reset_mocks()
+
+    def _reset_mocks(self):
+        """Clear calls and configured results left by the previous test or subTest."""
+        for mock in (self.mock_glob, self.mock_read, self.mock_upload):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+    def test_sync_to_cluster_templates(self):
+        """Test syncing index and component templates to cluster"""
+        cases = [
+            ("/path/to/templates", self.GLOB_INDEX_TEMPLATES, TEST_TEMPLATE, TemplateType.INDEX_TEMPLATE, None,
+             [call(TEST_TEMPLATE, "template1", TemplateType.INDEX_TEMPLATE, None),
+              call(TEST_TEMPLATE, "template2", TemplateType.INDEX_TEMPLATE, None)]),
+            ("/path/to/components", self.GLOB_COMPONENT_TEMPLATES, TEST_COMPONENT, TemplateType.COMPONENT_TEMPLATE, "8.0.0",
+             [call(TEST_COMPONENT, "component1", TemplateType.COMPONENT_TEMPLATE, "8.0.0")]),
+            # Template names are the file name stripped of its directory and .json extension
+            ("/complex/path/to", self.GLOB_COMPLEX_PATH, {"test": "data"}, TemplateType.INDEX_TEMPLATE, None,
+             [call({"test": "data"}, "my-template", TemplateType.INDEX_TEMPLATE, None)]),
         ]
-        
-        # Mock JSON data
-        mock_template_data = {"template": {"settings": {"number_of_shards": 1}}}
-        mock_read.return_value = mock_template_data
-        
-        # Mock successful upload
-        mock_upload.return_value = 200
-        
-        self.template_manager.sync_to_cluster(
-            "/path/to/templates", TemplateType.INDEX_TEMPLATE
-        )
-        
-        # Verify glob was called with correct pattern
-        mock_glob.assert_called_with("/path/to/templates/*.json")
-        
-        # Verify _read_json was called for each file
-        self.assertEqual(mock_read.call_count, 2)
-        mock_read.assert_any_call("/path/to/templates/template1.json")
-        mock_read.assert_any_call("/path/to/templates/template2.json")
-        
-        # Verify _upload_json was called for each template
-        self.assertEqual(mock_upload.call_count, 2)
-        mock_upload.assert_any_call(mock_template_data, "template1", TemplateType.INDEX_TEMPLATE, None)
-        mock_upload.assert_any_call(mock_template_data, "template2", TemplateType.INDEX_TEMPLATE, None)
-
-    @patch('glob.glob')
-    @patch.object(TemplateManager, '_read_json')
-    @patch.object(TemplateManager, '_upload_json')
-    def test_sync_to_cluster_component_templates(self, mock_upload, mock_read, mock_glob):
-        """Test syncing component templates to cluster"""
-        # Mock glob to return list of JSON files
-        mock_glob.return_value = ["/path/to/components/component1.json"]
-        
-        # Mock JSON data
-        mock_component_data = {"template": {"mappings": {"properties": {"field1": {"type": "text"}}}}}
-        mock_read.return_value = mock_component_data
-        
-        # Mock successful upload
-        mock_upload.return_value = 200
-        
-        version = "8.0.0"
-        self.template_manager.sync_to_cluster(
-            "/path/to/components", TemplateType.COMPONENT_TEMPLATE, version
-        )
-        
-        # Verify _upload_json was called with version
-        mock_upload.assert_called_with(
-            mock_component_data, "component1", TemplateType.COMPONENT_TEMPLATE, version
-        )
+        for directory, json_files, template_data, template_type, version, expected_uploads in cases:
+            with self.subTest(directory=directory):
+                self._reset_mocks()
+                self.mock_glob.return_value = json_files
+                self.mock_read.return_value = template_data
+                self.mock_upload.return_value = 200
+
+                self.template_manager.sync_to_cluster(directory, template_type, version)
+
+                # Verify glob was called with correct pattern
+                self.mock_glob.assert_called_once_with(f"{directory}/*.json")
 
-    @patch('glob.glob')
-    def test_sync_to_cluster_no_files(self, mock_glob):
+                # Verify each file was read and uploaded, in glob order
+                self.assertEqual(self.mock_read.call_args_list, [call(json_file) for json_file in json_files])
+                self.assertEqual(self.mock_upload.call_args_list, expected_uploads)
+
+    def test_sync_to_cluster_no_files(self):
         """Test syncing when no JSON files are found"""
         # Mock glob to return empty list
-        mock_glob.return_value = []
+        self.mock_glob.return_value = ()
         
         # This should not raise an exception
         self.template_manager.sync_to_cluster(
@@ -186,36 +186,13 @@ class TestTemplateManager(unittest.TestCase):
         )
         
         # Verify glob was called
-        mock_glob.assert_called_with("/path/to/empty/*.json")
+        self.mock_glob.assert_called_with("/path/to/empty/*.json")
+
 
-    def test_template_type_enum(self):
+class TestTemplateTypeEnum(unittest.TestCase):
+    """Unit tests for the TemplateType enum; no manager or mocks needed"""
+
+    def test_values(self):
         """Test TemplateType enum values"""
         self.assertEqual(TemplateType.INDEX_TEMPLATE.value, 1)
         self.assertEqual(TemplateType.COMPONENT_TEMPLATE.value, 2)
-
-    @patch('os.path.basename')
-    @patch('glob.glob')
-    @patch.object(TemplateManager, '_read_json')
-    @patch.object(TemplateManager, '_upload_json')
-    def test_sync_to_cluster_basename_extraction(self, mock_upload, mock_read, mock_glob, mock_basename):
-        """Test that template names are correctly extracted from file paths"""
-        mock_glob.return_value = ["/complex/path/to/my-template.json"]
-        mock_basename.return_value = "my-template.json"
-        mock_read.return_value = {"test": "data"}
-        mock_upload.return_value = 200
-        
-        self.template_manager.sync_to_cluster(
-            "/complex/path/to", TemplateType.INDEX_TEMPLATE
-        )
-        
-        # Verify basename was called to extract filename
-        mock_basename.assert_called_with("/complex/path/to/my-template.json")
-        
-        # Verify template name was correctly stripped of .json extension
-        mock_upload.assert_called_with(
-            {"test": "data"}, "my-template", TemplateType.INDEX_TEMPLATE, None
-        )
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file